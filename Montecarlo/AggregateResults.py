@@ -0,0 +1,200 @@
+import numpy as np
+
+from StreamingStats import StreamingStats
+from Trajectory import Trajectory
+
+
+class AggregateResults:
+    """
+    Resultados de una simulación reducidos a estadísticas de memoria fija,
+    en lugar de guardar cada juego y el historial de puntuaciones.
+
+    Por jugador resume el score, las rondas ganadas, la suerte final y la
+    experiencia de cada juego; por equipo, su score y rondas ganadas por
+    juego y los juegos ganados; además guarda una Trajectory del score final
+    acumulado de cada jugador. Los juegos sueltos se acumulan en arreglos de
+    bufferSize filas y se procesan por lotes; los informes combinan los
+    juegos pendientes con copias de las estadísticas, para que los lotes (y
+    con ellos el redondeo de las medias) no dependan de cuándo se piden.
+
+    Los histogramas tienen una cubeta por valor entero posible, salvo los de
+    score, cuyo rango va de 0 a rondas x (tiros por ronda + 1) x puntuación
+    máxima de un tiro, con maxResistance // 5 tiros por ronda; el tiro extra
+    cubre un desempate por ronda, y los desempates más largos, muy raros,
+    se cuentan como overflow.
+
+    Atributos:
+        letters (list): Letra de cada equipo.
+        playerIds (list): Identificador de cada jugador, equipo por equipo.
+        playerStats (dict): StreamingStats por dato de los jugadores.
+        teamStats (dict): StreamingStats por dato de los equipos.
+        gamesWon (ndarray): Juegos ganados por cada equipo.
+        trajectory (Trajectory): Score final acumulado de cada jugador.
+        buffer (dict): Juegos aún no procesados, un arreglo por dato.
+        buffered (int): Filas ocupadas de buffer.
+    """
+
+    def __init__(self, teams, config, maxPoints=1000, bufferSize=4096):
+        """
+        Args:
+            teams (list): Equipos de la simulación.
+            config (SimulationConfig): Parámetros de la simulación, de los que
+                salen los rangos de los histogramas.
+            maxPoints (int): Opcional, puntos máximos de la trayectoria.
+            bufferSize (int): Opcional, juegos que se acumulan antes de
+                actualizar las estadísticas.
+        """
+        nTeams = len(teams)
+        nPlayers = len(teams[0].players)
+        rounds = config.rounds
+        topScore = max(score for prob, score in config.womenScore + config.menScore)
+        maxScore = rounds * ((config.maxResistance // 5) + 1) * topScore
+        self.letters = [team.letter for team in teams]
+        self.playerIds = [player.id for team in teams for player in team.players]
+        self.playerStats = {"scoreByGame": StreamingStats(self.playerIds, 0, maxScore, 100),
+                            "roundsWon": StreamingStats(self.playerIds, 0, rounds + 1, rounds + 1),
+                            "luck": StreamingStats(self.playerIds, 0, rounds + 1, rounds + 1),
+                            "experience": StreamingStats(self.playerIds, config.experience,
+                                                         config.experience + (3 * rounds) + 1, (3 * rounds) + 1)}
+        self.teamStats = {"scoreByGame": StreamingStats(self.letters, 0, maxScore * nPlayers, 100),
+                          "roundsWon": StreamingStats(self.letters, 0, rounds + 1, rounds + 1)}
+        self.gamesWon = np.zeros(nTeams, dtype=np.int64)
+        self.trajectory = Trajectory(maxPoints)
+        players = (bufferSize, nTeams, nPlayers)
+        self.buffer = {"game": np.zeros(bufferSize, dtype=np.int64),
+                       "winnerTeam": np.zeros(bufferSize, dtype=np.int64),
+                       "scoreByGame": np.zeros(players, dtype=np.int64),
+                       "finalScore": np.zeros(players, dtype=np.int64),
+                       "roundsWon": np.zeros(players, dtype=np.int64),
+                       "luck": np.zeros(players, dtype=np.int64),
+                       "experience": np.zeros(players, dtype=np.int64)}
+        self.buffered = 0
+
+    def add(self, record, finalScores, statsByPlayer):
+        """
+        Agrega un juego terminado.
+
+        Args:
+            record (GameRecord): Resumen del juego.
+            finalScores (tuple): Por equipo, el score final acumulado de cada
+                jugador después del juego.
+            statsByPlayer (list): Por equipo, (rondas ganadas, suerte final,
+                experiencia) de cada jugador, como en Game.statsByPlayer.
+        """
+        row = self.buffered
+        self.buffer["game"][row] = record.id
+        self.buffer["winnerTeam"][row] = self.letters.index(record.winnerTeam)
+        self.buffer["scoreByGame"][row] = record.scoreByGame
+        self.buffer["finalScore"][row] = finalScores
+        stats = np.array(statsByPlayer)
+        self.buffer["roundsWon"][row] = stats[:, :, 0]
+        self.buffer["luck"][row] = stats[:, :, 1]
+        self.buffer["experience"][row] = stats[:, :, 2]
+        self.buffered += 1
+        if self.buffered == len(self.buffer["game"]):
+            self.flush()
+
+    def addBatch(self, columns):
+        """
+        Agrega varios juegos de una vez, con un arreglo por dato como los de
+        VectorEngine.simulateBatch más la columna "game".
+
+        Args:
+            columns (dict): Arreglos con una fila por juego.
+        """
+        self.flush()
+        self.update(columns)
+
+    def flush(self):
+        """
+        Actualiza las estadísticas con los juegos acumulados en buffer.
+        """
+        if self.buffered == 0:
+            return
+        self.update({name: values[0:self.buffered] for name, values in self.buffer.items()})
+        self.buffered = 0
+
+    def getPending(self):
+        """
+        Returns:
+            dict: Los juegos de buffer aún no procesados, un arreglo por dato.
+        """
+        return {name: values[0:self.buffered] for name, values in self.buffer.items()}
+
+    def getBatchValues(self, columns):
+        """
+        Args:
+            columns (dict): Arreglos con una fila por juego, como en update.
+
+        Returns:
+            tuple: Por dato de los jugadores y por dato de los equipos, los
+            valores de forma (juegos, variables) de su StreamingStats.
+        """
+        nGames = len(columns["game"])
+        players = {name: columns[name].reshape(nGames, -1) for name in self.playerStats}
+        teams = {"scoreByGame": columns["scoreByGame"].sum(axis=2),
+                 "roundsWon": columns["roundsWon"].sum(axis=2)}
+        return players, teams
+
+    def update(self, columns):
+        players, teams = self.getBatchValues(columns)
+        for name, values in players.items():
+            self.playerStats[name].update(values)
+        for name, values in teams.items():
+            self.teamStats[name].update(values)
+        self.gamesWon += np.bincount(columns["winnerTeam"], minlength=len(self.letters))
+        self.trajectory.add(columns["game"], columns["finalScore"].reshape(len(columns["game"]), -1))
+
+    def getCurrentTrajectory(self):
+        """
+        Returns:
+            Trajectory: La trayectoria si no hay juegos en buffer, o una
+            copia que también los incluye.
+        """
+        if self.buffered == 0:
+            return self.trajectory
+        return self.trajectory.getMerged(self.buffer["game"][0:self.buffered],
+                                         self.buffer["finalScore"][0:self.buffered].reshape(self.buffered, -1))
+
+    def getTrajectory(self):
+        """
+        Returns:
+            tuple: Juegos de la trayectoria y, por equipo, el score final
+            acumulado de sus jugadores en esos juegos, de forma
+            (puntos, jugadores).
+        """
+        games, values = self.getCurrentTrajectory().getPoints()
+        nPlayers = len(self.playerIds) // len(self.letters)
+        return games, values.reshape(len(games), len(self.letters), nPlayers).transpose(1, 0, 2)
+
+    def getReport(self):
+        """
+        Los juegos en buffer se incluyen combinándolos con copias de las
+        StreamingStats y de la trayectoria; este objeto no cambia.
+
+        Returns:
+            dict: Estadísticas por jugador ("players") y por equipo
+            ("teams") y la trayectoria del score final de cada jugador.
+        """
+        playerStats, teamStats, gamesWon = self.playerStats, self.teamStats, self.gamesWon
+        if self.buffered:
+            pending = self.getPending()
+            players, teams = self.getBatchValues(pending)
+            playerStats = {name: stats.getMerged(players[name]) for name, stats in playerStats.items()}
+            teamStats = {name: stats.getMerged(teams[name]) for name, stats in teamStats.items()}
+            gamesWon = gamesWon + np.bincount(pending["winnerTeam"], minlength=len(self.letters))
+        trajectory = self.getCurrentTrajectory()
+        players = {id: {} for id in self.playerIds}
+        for name, stats in playerStats.items():
+            for id, report in stats.getReport().items():
+                players[id][name] = report
+        teams = {letter: {"gamesWon": int(won)} for letter, won in zip(self.letters, gamesWon)}
+        for name, stats in teamStats.items():
+            for letter, report in stats.getReport().items():
+                teams[letter][name] = report
+        games, values = trajectory.getPoints()
+        return {"players": players,
+                "teams": teams,
+                "trajectory": {"stride": trajectory.stride,
+                               "games": games.tolist(),
+                               "finalScore": {id: values[:, i].tolist() for i, id in enumerate(self.playerIds)}}}
@@ -0,0 +1,158 @@
+import math
+
+from scipy.stats import norm
+
+from RunningMean import RunningMean
+
+
+class ConvergenceMonitor:
+    """
+    Decide cuándo detener una simulación porque sus estimaciones ya tienen la
+    precisión pedida.
+
+    Sigue con un RunningMean por estimación la proporción de juegos ganados
+    por cada género (W, M), la proporción ganada por cada equipo (por su
+    letra) y el score medio por juego de cada jugador (por su id). La
+    simulación puede parar cuando, con al menos minGames juegos, el
+    semiancho del intervalo de confianza de cada proporción es menor que
+    proportionHalfWidth y el de cada score medio es menor que
+    scoreHalfWidth; nunca pasa de maxGames.
+
+    Atributos:
+        minGames (int): Juegos mínimos antes de poder parar.
+        maxGames (int): Juegos máximos.
+        confidence (float): Nivel de confianza de los intervalos.
+        checkEvery (int): Juegos entre revisiones de la precisión.
+        estimates (dict): RunningMean por nombre de estimación.
+        converged (bool): Si ya se alcanzó la precisión pedida.
+    """
+
+    def __init__(self, proportionHalfWidth=0.01, scoreHalfWidth=2.0, confidence=0.95, minGames=1000,
+                 maxGames=200000, checkEvery=100):
+        """
+        Args:
+            proportionHalfWidth (float): Semiancho máximo para las proporciones.
+            scoreHalfWidth (float): Semiancho máximo para los scores medios.
+            confidence (float): Nivel de confianza de los intervalos.
+            minGames (int): Juegos mínimos antes de poder parar.
+            maxGames (int): Juegos máximos.
+            checkEvery (int): Juegos entre revisiones de la precisión.
+        """
+        self.targets = {"proportion": proportionHalfWidth, "score": scoreHalfWidth}
+        self.confidence = confidence
+        self.z = float(norm.ppf(0.5 + (confidence / 2)))
+        self.minGames = minGames
+        self.maxGames = maxGames
+        self.checkEvery = checkEvery
+        self.estimates = {}
+        self.kinds = {}
+        self.letters = []
+        self.playerIds = []
+        self.converged = False
+        self.games = 0
+        self.nextCheck = minGames
+
+    def start(self, teams):
+        """
+        Crea las estimaciones para los equipos y jugadores de la simulación.
+
+        Args:
+            teams (list): Equipos del simulador.
+        """
+        if self.estimates:
+            return
+        self.letters = [team.letter for team in teams]
+        for name in ["W", "M"] + self.letters:
+            self.estimates[name] = RunningMean()
+            self.kinds[name] = "proportion"
+        for team in teams:
+            for player in team.players:
+                self.estimates[player.id] = RunningMean()
+                self.kinds[player.id] = "score"
+        self.playerIds = [[player.id for player in team.players] for team in teams]
+
+    def update(self, record):
+        """
+        Agrega un juego terminado.
+
+        Args:
+            record (GameRecord): Resumen del juego.
+
+        Returns:
+            bool: True si la simulación debe parar.
+        """
+        estimates = self.estimates
+        estimates["W"].update(1 if record.roundsWonW > record.roundsWonM else 0)
+        estimates["M"].update(1 if record.roundsWonM > record.roundsWonW else 0)
+        for letter in self.letters:
+            estimates[letter].update(1 if record.winnerTeam == letter else 0)
+        for ids, scores in zip(self.playerIds, record.scoreByGame):
+            for id, score in zip(ids, scores):
+                estimates[id].update(score)
+        self.games += 1
+        return self.shouldStop()
+
+    def updateBatch(self, batch):
+        """
+        Agrega un lote de VectorEngine.simulateBatch.
+
+        Args:
+            batch (dict): Arreglos del lote, una fila por juego.
+
+        Returns:
+            bool: True si la simulación debe parar.
+        """
+        self.estimates["W"].updateBatch(batch["roundsWonW"] > batch["roundsWonM"])
+        self.estimates["M"].updateBatch(batch["roundsWonM"] > batch["roundsWonW"])
+        for t, letter in enumerate(self.letters):
+            self.estimates[letter].updateBatch(batch["winnerTeam"] == t)
+        for t, ids in enumerate(self.playerIds):
+            for p, id in enumerate(ids):
+                self.estimates[id].updateBatch(batch["scoreByGame"][:, t, p])
+        self.games += len(batch["winnerTeam"])
+        return self.shouldStop()
+
+    def shouldStop(self):
+        """
+        Revisa la precisión cada checkEvery juegos a partir de minGames, y
+        al llegar a maxGames.
+
+        Returns:
+            bool: True si se alcanzó la precisión o maxGames.
+        """
+        if self.games >= self.nextCheck or self.games >= self.maxGames:
+            self.nextCheck = max(self.games + self.checkEvery, self.minGames)
+            self.converged = self.games >= self.minGames and all(
+                estimate.getHalfWidth(self.z) < self.targets[self.kinds[name]]
+                for name, estimate in self.estimates.items())
+        return self.converged or self.games >= self.maxGames
+
+    def getRequiredGames(self):
+        """
+        Returns:
+            int: Juegos que necesita una proporción cercana a 0.5, la de
+            mayor varianza, para alcanzar proportionHalfWidth.
+        """
+        return math.ceil((self.z * 0.5 / self.targets["proportion"]) ** 2)
+
+    def getReport(self):
+        """
+        Returns:
+            dict: Juegos usados, si se alcanzó la precisión y, por
+            estimación, su media, semiancho e intervalo de confianza.
+        """
+        estimates = {}
+        for name, estimate in self.estimates.items():
+            halfWidth = estimate.getHalfWidth(self.z)
+            estimates[name] = {"kind": self.kinds[name],
+                               "mean": estimate.mean,
+                               "halfWidth": halfWidth,
+                               "low": estimate.mean - halfWidth,
+                               "high": estimate.mean + halfWidth,
+                               "target": self.targets[self.kinds[name]]}
+        return {"games": self.games,
+                "converged": self.converged,
+                "confidence": self.confidence,
+                "minGames": self.minGames,
+                "maxGames": self.maxGames,
+                "estimates": estimates}
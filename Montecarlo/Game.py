@@ -1,43 +1,54 @@
 from Round import Round
+from SimulationConfig import SimulationConfig
 
 class Game:
     """
     Clase que representa un juego entre equipos.
     """
 
-    def __init__(self, teams, id):
+    def __init__(self, teams, id, fastTurns=False, config=None):
         """
         Inicializa un nuevo juego con los equipos proporcionados.
 
         Args:
             teams (list): Lista de equipos participantes en el juego.
+            fastTurns (bool): Opcional, las rondas usan Round.playFastTurn.
+            config (SimulationConfig): Opcional, rondas por juego y tablas de
+                puntuación.
         """
         self.id = id
         self.teams = teams
+        self.fastTurns = fastTurns
+        self.config = config or SimulationConfig()
         self.actualWinnerPlayer = None
         self.actualWinnerTeam = None
         self.winnerPlayer = None
         self.luckiestPlayer = None
         self.playerWithMostXP = None
         self.winsByGender = {"W": 0, "M": 0}
+        self.statsByPlayer = None
+        self.teamScoreByRound = []
 
     def simulateGame(self):
         """
         Simula un juego completo.
 
-        Realiza 10 rondas de juego, actualizando los equipos.
+        Realiza config.rounds rondas de juego (10 por defecto), actualizando los equipos.
+        Guarda en teamScoreByRound el score que sumó cada equipo en cada ronda.
         """
         self.restartScoreByGame()
-        for i in range(0, 10):
-            round = Round(self.teams)
+        for i in range(0, self.config.rounds):
+            round = Round(self.teams, self.fastTurns, self.config)
             self.actualWinnerPlayer = round.simulateRound()
             self.teams = round.teams
             self.increaseWinsByGender(self.actualWinnerPlayer)
+            self.teamScoreByRound.append([team.scoreByRound for team in self.teams])
             self.restartScoreByPlayer()
         self.getWinnerTeam()
         self.getWinnerPlayer()
         self.getLuckiestPlayer()
         self.getPlayerWithTheMostXP()
+        self.saveStatsByPlayer()
         self.restartSkills()
 
     def increaseWinsByGender(self, winner):
@@ -56,9 +67,8 @@ class Game:
         aux = max(self.teams, key=lambda x: x.roundsWon)
         for team in self.teams:
             team.restartRoundsWon()
-            if team.letter == aux.letter:
-                self.actualWinnerTeam = aux
-                team.increaseWinCounter()
+        self.actualWinnerTeam = aux
+        aux.increaseWinCounter()
 
 
     def getWinnerPlayer(self):
@@ -88,6 +98,14 @@ class Game:
             aux.append(max(team.players, key=lambda x: x.experience))
         self.playerWithMostXP = max(aux, key=lambda x: x.experience)
 
+    def saveStatsByPlayer(self):
+        """
+        Guarda, antes de reiniciarlas, las rondas ganadas, la suerte final y
+        la experiencia de cada jugador en el juego.
+        """
+        self.statsByPlayer = [[(player.wonRound, player.finalLuck, player.experience) for player in team.players]
+                              for team in self.teams]
+
     def restartScoreByPlayer(self):
         """
         Reinicia la puntuación de los jugadores de los equipos.
@@ -0,0 +1,148 @@
+import numpy as np
+
+from GameRecord import GameRecord
+from ResultsStore import ResultsStore
+
+
+class GameIndex:
+    """
+    Índice compacto de los juegos simulados, para recorrerlos en MainWindow.
+
+    Guarda una columna de NumPy por dato de los juegos (identificador,
+    equipo ganador, rondas ganadas por género, jugadores destacados y score
+    de cada jugador), en memoria o mapeadas desde un ResultsStore, y crea el
+    GameRecord de un juego solo cuando se pide. Los identificadores de los
+    juegos son crecientes, así que se buscan por bisección.
+
+    Atributos:
+        columns (dict): Arreglo con una fila por juego para cada dato; los
+            jugadores destacados se guardan como equipo * nPlayers + jugador.
+        letters (list): Letra de cada equipo.
+        playerIds (list): Identificador de cada jugador, en el orden de las
+            columnas de jugadores destacados.
+    """
+
+    playerColumns = ("winnerPlayer", "luckiestPlayer", "playerWithMostXP")
+
+    def __init__(self, columns):
+        """
+        Args:
+            columns (dict): Arreglos de los juegos, como los de
+                ResultsStore.load.
+        """
+        self.columns = columns
+        nTeams, nPlayers = columns["scoreByGame"].shape[1:]
+        self.letters = [chr(ord("A") + t) for t in range(0, nTeams)]
+        self.playerIds = ResultsStore.getPlayerIds(nTeams, nPlayers)
+
+    @classmethod
+    def fromRecords(cls, records, nTeams=2, nPlayers=5):
+        """
+        Crea el índice a partir de los GameRecord de una simulación.
+
+        Args:
+            records (list): Resúmenes de los juegos, en orden.
+            nTeams (int): Opcional, equipos del índice si records está vacío.
+            nPlayers (int): Opcional, jugadores por equipo si records está
+                vacío.
+
+        Returns:
+            GameIndex: Índice con las columnas en memoria.
+        """
+        scoreByGame = np.array([record.scoreByGame for record in records], dtype=np.int32)
+        if not records:
+            scoreByGame = np.zeros((0, nTeams, nPlayers), dtype=np.int32)
+        nTeams, nPlayers = scoreByGame.shape[1:]
+        playerIndex = {id: i for i, id in enumerate(ResultsStore.getPlayerIds(nTeams, nPlayers))}
+        columns = {"game": np.array([record.id for record in records], dtype=np.int64),
+                   "winnerTeam": np.array([ord(record.winnerTeam) - ord("A") for record in records], dtype=np.int8),
+                   "roundsWonW": np.array([record.roundsWonW for record in records], dtype=np.int16),
+                   "roundsWonM": np.array([record.roundsWonM for record in records], dtype=np.int16),
+                   "scoreByGame": scoreByGame}
+        for name in cls.playerColumns:
+            columns[name] = np.array([playerIndex[getattr(record, name)] for record in records], dtype=np.int16)
+        return cls(columns)
+
+    @classmethod
+    def fromStore(cls, path):
+        """
+        Abre el índice sobre un ResultsStore, sin cargar los juegos en memoria.
+
+        Args:
+            path (str): Directorio del almacén.
+
+        Returns:
+            GameIndex: Índice con las columnas en memoria mapeada.
+        """
+        return cls(ResultsStore.load(path))
+
+    def __len__(self):
+        return len(self.columns["game"])
+
+    def findRow(self, gameId):
+        """
+        Busca la fila de un juego por su identificador.
+
+        Args:
+            gameId (int): Identificador del juego.
+
+        Returns:
+            int: Fila del juego, o None si no está en el índice.
+        """
+        ids = self.columns["game"]
+        row = int(np.searchsorted(ids, gameId))
+        if row < len(ids) and ids[row] == gameId:
+            return row
+        return None
+
+    def getWinnerGenders(self, rows):
+        """
+        Args:
+            rows (ndarray): Filas de los juegos.
+
+        Returns:
+            ndarray: "W" o "M" según qué género ganó más rondas en cada
+            juego, o "-" si empataron.
+        """
+        roundsWonW = self.columns["roundsWonW"][rows]
+        roundsWonM = self.columns["roundsWonM"][rows]
+        return np.where(roundsWonW > roundsWonM, "W", np.where(roundsWonM > roundsWonW, "M", "-"))
+
+    def filter(self, winnerTeam=None, winnerGender=None):
+        """
+        Filas de los juegos que cumplen los filtros dados.
+
+        Args:
+            winnerTeam (str): Opcional, letra del equipo ganador.
+            winnerGender (str): Opcional, "W", "M" o "-" (empate), como en
+                getWinnerGenders.
+
+        Returns:
+            ndarray: Filas en orden de juego.
+        """
+        selected = np.ones(len(self), dtype=bool)
+        if winnerTeam is not None:
+            selected &= self.columns["winnerTeam"] == self.letters.index(winnerTeam)
+        if winnerGender is not None:
+            selected &= self.getWinnerGenders(slice(None)) == winnerGender
+        return np.flatnonzero(selected)
+
+    def getRecord(self, row):
+        """
+        Crea el resumen de un juego a partir de su fila.
+
+        Args:
+            row (int): Fila del juego.
+
+        Returns:
+            GameRecord: Resumen del juego; los jugadores destacados que no
+            tenga el almacén se muestran como "-".
+        """
+        players = [self.playerIds[int(self.columns[name][row])] if name in self.columns else "-"
+                   for name in self.playerColumns]
+        return GameRecord(int(self.columns["game"][row]),
+                          self.letters[int(self.columns["winnerTeam"][row])],
+                          *players,
+                          int(self.columns["roundsWonW"][row]),
+                          int(self.columns["roundsWonM"][row]),
+                          tuple(tuple(scores) for scores in self.columns["scoreByGame"][row].tolist()))
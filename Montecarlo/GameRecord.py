@@ -0,0 +1,74 @@
+from typing import NamedTuple
+
+
+class GameRecord(NamedTuple):
+    """
+    Resumen inmutable de un juego terminado, con lo que muestra MainWindow.
+
+    Atributos:
+        id (int): Identificador del juego.
+        winnerTeam (str): Letra del equipo ganador.
+        winnerPlayer (str): Identificador del jugador ganador.
+        luckiestPlayer (str): Identificador del jugador con más suerte.
+        playerWithMostXP (str): Identificador del jugador con más experiencia.
+        roundsWonW (int): Rondas ganadas por mujeres en el juego.
+        roundsWonM (int): Rondas ganadas por hombres en el juego.
+        scoreByGame (tuple): Por cada equipo, la tupla con el score de sus
+            jugadores en el juego.
+    """
+    id: int
+    winnerTeam: str
+    winnerPlayer: str
+    luckiestPlayer: str
+    playerWithMostXP: str
+    roundsWonW: int
+    roundsWonM: int
+    scoreByGame: tuple
+
+    @classmethod
+    def fromGame(cls, game):
+        """
+        Crea el resumen de un juego recién simulado, sin copiar sus objetos.
+
+        Args:
+            game (Game): Juego ya simulado.
+
+        Returns:
+            GameRecord: Resumen del juego.
+        """
+        return cls(game.id,
+                   game.actualWinnerTeam.letter,
+                   game.winnerPlayer.id,
+                   game.luckiestPlayer.id,
+                   game.playerWithMostXP.id,
+                   game.winsByGender["W"],
+                   game.winsByGender["M"],
+                   tuple(tuple(player.scoreByGame for player in team.players) for team in game.teams))
+
+    @classmethod
+    def fromBatch(cls, batch, teams, firstGameId):
+        """
+        Crea los resúmenes de un lote de VectorEngine.simulateBatch.
+
+        Args:
+            batch (dict): Arreglos del lote, una fila por juego.
+            teams (list): Equipos simulados, para traducir índices a
+                letras e identificadores.
+            firstGameId (int): Identificador del primer juego del lote.
+
+        Returns:
+            list: Un GameRecord por juego.
+        """
+        letters = [team.letter for team in teams]
+        ids = [[player.id for player in team.players] for team in teams]
+
+        def getIds(pairs):
+            return [ids[team][player] for team, player in pairs.tolist()]
+
+        return [cls(firstGameId + i, letters[winnerTeam], winnerPlayer, luckiestPlayer, playerWithMostXP,
+                    roundsWonW, roundsWonM, tuple(tuple(scores) for scores in scoreByGame))
+                for i, (winnerTeam, winnerPlayer, luckiestPlayer, playerWithMostXP, roundsWonW, roundsWonM, scoreByGame)
+                in enumerate(zip(batch["winnerTeam"].tolist(), getIds(batch["winnerPlayer"]),
+                                 getIds(batch["luckiestPlayer"]), getIds(batch["playerWithMostXP"]),
+                                 batch["roundsWonW"].tolist(), batch["roundsWonM"].tolist(),
+                                 batch["scoreByGame"].tolist()))]
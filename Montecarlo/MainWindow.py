@@ -1,33 +1,107 @@
 import tkinter as tk
-import matplotlib.pyplot as plt
 from tkinter import ttk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 class MainWindow(tk.Toplevel):
     """
     Clase para la ventana principal de la aplicación del simulador Montecarlo.
+
+    Los juegos se muestran por páginas de pageSize filas de un GameIndex,
+    filtrados por equipo ganador y por el género que ganó más rondas; solo
+    las filas de la página visible existen como elementos de la lista, y el
+    GameRecord del juego seleccionado se crea al mostrarlo.
+
+    Las gráficas de score por juego están en una sola figura dentro de la
+    ventana; al cambiar de juego solo se actualizan las alturas y etiquetas
+    de sus barras.
+
+    Con un SimulationWorker la ventana se abre mientras la simulación corre:
+    consulta su cola cada pollMs milisegundos con after(), muestra el avance
+    y permite cancelarla (salvo en modo paralelo), y al terminar carga los juegos simulados. Las
+    gráficas en vivo (victorias por género e historial de puntuaciones) se
+    dibujan en el hilo de Tk a partir del último aviso de avance, en una
+    pestaña aparte de las del juego seleccionado; sus barras y líneas se
+    dibujan sobre el fondo guardado (blitting) y la figura completa solo se
+    redibuja cuando hay que ampliar un eje.
     """
 
-    def __init__(self, parent, games):
+    pageSize = 100
+    pollMs = 100
+    allLabel = "Todos"
+    genderLabels = {"W": "Mujeres", "M": "Hombres", "-": "Empate"}
+
+    def __init__(self, parent, games, worker=None):
         """
         Inicializa la ventana principal.
 
         Args:
             parent: El widget padre al que pertenece esta ventana.
-            games (list): Lista de objetos Game que representan los juegos simulados.
+            games (GameIndex): Índice de los juegos simulados.
+            worker (SimulationWorker): Opcional, simulación en curso; al
+                terminar, su resultado (un GameIndex) reemplaza a games.
         """
         super().__init__(parent)
         self.title("Simulador Montecarlo")
-        self.geometry("400x200")
+        self.geometry("1100x520")
 
         self.games = games
+        self.rows = games.filter()
+        self.page = 0
+        self.worker = worker
 
         # Frame principal
         main_frame = ttk.Frame(self)
-        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        # Combo box para seleccionar el juego
-        self.gameComboBox = ttk.Combobox(main_frame, values=["Juego " + str(game.id) for game in self.games])
-        self.gameComboBox.pack()
+        # Avance de la simulación en curso
+        if worker is not None:
+            progress_frame = ttk.Frame(main_frame)
+            progress_frame.pack(fill=tk.X)
+            self.progressBar = ttk.Progressbar(progress_frame, mode="determinate")
+            self.progressBar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+            self.cancelButton = ttk.Button(progress_frame, text="Cancelar", command=self.cancelSimulation)
+            self.cancelButton.pack(side=tk.RIGHT)
+            if not worker.cancellable:
+                self.cancelButton.config(state=tk.DISABLED)
+            self.progressLabel = ttk.Label(main_frame, text="Simulando...")
+            self.progressLabel.pack(fill=tk.X)
+
+        # Filtros y búsqueda por identificador
+        filter_frame = ttk.Frame(main_frame)
+        filter_frame.pack(fill=tk.X)
+        ttk.Label(filter_frame, text="Equipo ganador:").pack(side=tk.LEFT)
+        self.teamFilter = ttk.Combobox(filter_frame, values=[self.allLabel] + games.letters, state="readonly", width=8)
+        self.teamFilter.set(self.allLabel)
+        self.teamFilter.bind("<<ComboboxSelected>>", lambda event: self.applyFilters())
+        self.teamFilter.pack(side=tk.LEFT)
+        ttk.Label(filter_frame, text="Género ganador:").pack(side=tk.LEFT)
+        self.genderFilter = ttk.Combobox(filter_frame, values=[self.allLabel] + list(self.genderLabels.values()),
+                                         state="readonly", width=10)
+        self.genderFilter.set(self.allLabel)
+        self.genderFilter.bind("<<ComboboxSelected>>", lambda event: self.applyFilters())
+        self.genderFilter.pack(side=tk.LEFT)
+        self.jumpEntry = ttk.Entry(filter_frame, width=10)
+        self.jumpEntry.bind("<Return>", lambda event: self.jumpToGame())
+        self.jumpEntry.pack(side=tk.LEFT)
+        ttk.Button(filter_frame, text="Ir al juego", command=self.jumpToGame).pack(side=tk.LEFT)
+
+        # Lista de los juegos de la página actual
+        self.gameList = ttk.Treeview(main_frame, columns=("game", "winnerTeam", "winnerGender", "roundsWonW", "roundsWonM"),
+                                     show="headings", height=12, selectmode="browse")
+        for column, heading in zip(self.gameList["columns"], ("Juego", "Equipo ganador", "Género ganador", "Rondas W", "Rondas M")):
+            self.gameList.heading(column, text=heading)
+            self.gameList.column(column, width=110, anchor=tk.CENTER)
+        self.gameList.bind("<<TreeviewSelect>>", lambda event: self.start_graph())
+        self.gameList.pack(fill=tk.BOTH, expand=True)
+
+        # Paginación
+        page_frame = ttk.Frame(main_frame)
+        page_frame.pack(fill=tk.X)
+        ttk.Button(page_frame, text="<", command=lambda: self.showPage(self.page - 1)).pack(side=tk.LEFT)
+        self.pageLabel = ttk.Label(page_frame, text="")
+        self.pageLabel.pack(side=tk.LEFT, expand=True)
+        ttk.Button(page_frame, text=">", command=lambda: self.showPage(self.page + 1)).pack(side=tk.RIGHT)
 
         # Botón para mostrar información del juego seleccionado
         self.acceptButton = ttk.Button(main_frame, text="Mostrar", command=self.start_graph)
@@ -43,57 +117,281 @@ class MainWindow(tk.Toplevel):
         self.mostExperienceLabel = ttk.Label(main_frame, text="")
         self.mostExperienceLabel.pack()
 
+        # Con una simulación en curso, pestañas para sus gráficas en vivo y
+        # las del juego seleccionado
+        chartsFrame = self
+        if worker is not None:
+            charts = ttk.Notebook(self)
+            charts.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+            liveFrame = ttk.Frame(charts)
+            chartsFrame = ttk.Frame(charts)
+            charts.add(liveFrame, text="Simulación")
+            charts.add(chartsFrame, text="Juego")
+            self.createLiveCharts(liveFrame, games.letters, games.columns["scoreByGame"].shape[2])
+
+        # Gráficas de score por juego, una por equipo, creadas una sola vez
+        nPlayers = games.columns["scoreByGame"].shape[2]
+        playerNames = [f"Jugador {i+1}" for i in range(nPlayers)]
+        self.figure = Figure(figsize=(5, 5))
+        self.scoreBars = []
+        self.scoreLabels = []
+        for i, letter in enumerate(games.letters):
+            axis = self.figure.add_subplot(len(games.letters), 1, i + 1)
+            bars = axis.bar(playerNames, [0] * nPlayers)
+            self.scoreBars.append(bars)
+            self.scoreLabels.append([axis.text(bar.get_x() + (bar.get_width() / 2), 0, "", ha="center", va="bottom")
+                                     for bar in bars])
+            axis.set_title("Score por juego - Equipo " + letter)
+            axis.set_xlabel("Jugador")
+            axis.set_ylabel("Score")
+        self.figure.tight_layout()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=chartsFrame)
+        self.canvas.get_tk_widget().pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+
+        self.showPage(0)
+        if worker is not None:
+            self.after(self.pollMs, self.pollWorker)
+
+    def createLiveCharts(self, parent, letters, nPlayers):
+        """
+        Crea la figura de las gráficas en vivo; showProgress solo actualiza
+        los datos de sus barras y líneas, que son animadas: el dibujo
+        completo de la figura no las incluye y saveLiveBackground guarda ese
+        fondo para dibujarlas encima.
+
+        Args:
+            parent: Widget donde se coloca la figura.
+            letters (list): Letras de los equipos.
+            nPlayers (int): Jugadores por equipo.
+        """
+        self.liveFigure = Figure(figsize=(5, 5))
+        genderAxis = self.liveFigure.add_subplot(2, 1, 1)
+        self.genderBars = genderAxis.bar([self.genderLabels["W"], self.genderLabels["M"]], [0, 0], animated=True)
+        genderAxis.set_ylim(0, 10)
+        genderAxis.set_title("Victorias por género")
+        genderAxis.set_ylabel("Victorias")
+        scoresAxis = self.liveFigure.add_subplot(2, 1, 2)
+        self.scoreLines = [[scoresAxis.plot([], [], label=f"Equipo {letter} - Jugador {i+1}", animated=True)[0]
+                            for i in range(nPlayers)]
+                           for letter in letters]
+        scoresAxis.set_xlim(0, 10)
+        scoresAxis.set_ylim(0, 10)
+        scoresAxis.set_title("Historial de puntuaciones por jugador")
+        scoresAxis.set_xlabel("Juego")
+        scoresAxis.set_ylabel("Puntuación final")
+        scoresAxis.legend(fontsize="x-small", ncol=2)
+        scoresAxis.grid(True)
+        self.liveFigure.tight_layout()
+        self.liveCanvas = FigureCanvasTkAgg(self.liveFigure, master=parent)
+        self.liveCanvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.liveBackground = None
+        self.liveCanvas.mpl_connect("draw_event", self.saveLiveBackground)
+
+    def saveLiveBackground(self, event):
+        """
+        Guarda el fondo de las gráficas en vivo tras cada dibujo completo
+        (al ampliar un eje o cambiar el tamaño de la ventana) y dibuja
+        encima las barras y líneas.
+        """
+        self.liveBackground = self.liveCanvas.copy_from_bbox(self.liveFigure.bbox)
+        self.drawLiveArtists()
+
+    def drawLiveArtists(self):
+        for bar in self.genderBars:
+            self.liveFigure.draw_artist(bar)
+        for lines in self.scoreLines:
+            for line in lines:
+                self.liveFigure.draw_artist(line)
+
+    def extendLimit(self, getLimit, setLimit, value):
+        """
+        Duplica el límite superior de un eje hasta que value quepa, de modo
+        que los redibujos completos sean pocos.
+
+        Returns:
+            bool: True si el límite cambió.
+        """
+        bottom, top = getLimit()
+        if value <= top:
+            return False
+        while top < value:
+            top *= 2
+        setLimit(bottom, top)
+        return True
+
+    def pollWorker(self):
+        """
+        Procesa los mensajes de la simulación en curso; de varios avances
+        pendientes solo se muestra el último.
+        """
+        progress = None
+        for kind, content in self.worker.getMessages():
+            if kind == "progress":
+                progress = content
+            elif kind == "done":
+                if progress is not None:
+                    self.showProgress(progress)
+                self.finishSimulation(content)
+                return
+            else:
+                self.progressLabel.config(text="Error en la simulación: " + str(content))
+                self.cancelButton.config(state=tk.DISABLED)
+                return
+        if progress is not None:
+            self.showProgress(progress)
+        self.after(self.pollMs, self.pollWorker)
+
+    def showProgress(self, progress):
+        """
+        Muestra los juegos simulados, las victorias por género y el score
+        medio por juego de cada equipo, y actualiza las gráficas en vivo.
+
+        Args:
+            progress (dict): Avance, como en Montecarlo.getProgress.
+        """
+        self.progressBar.config(maximum=max(progress["targetGames"], 1), value=progress["games"])
+        wins = progress["winsByGender"]
+        means = progress["meanScoreByGame"]
+        teamMeans = ", ".join(f"{letter} {sum(score for id, score in means.items() if id.endswith(letter)):.1f}"
+                              for letter in progress["gamesWonByTeam"])
+        self.progressLabel.config(text=f"{progress['games']} de {progress['targetGames']} juegos - "
+                                       f"mujeres {wins['W']}, hombres {wins['M']} - score por juego: {teamMeans}")
+
+        for bar, gender in zip(self.genderBars, ("W", "M")):
+            bar.set_height(wins[gender])
+        genderAxis = self.genderBars[0].axes
+        rescaled = self.extendLimit(genderAxis.get_ylim, genderAxis.set_ylim, max(wins["W"], wins["M"]))
+        games, scores = progress["trajectory"]
+        for lines, teamScores in zip(self.scoreLines, scores):
+            for i, line in enumerate(lines):
+                line.set_data(games, teamScores[:, i])
+        if len(games) > 0:
+            scoresAxis = self.scoreLines[0][0].axes
+            rescaled = self.extendLimit(scoresAxis.get_xlim, scoresAxis.set_xlim, games[-1]) or rescaled
+            top = max(teamScores[-1].max() for teamScores in scores)
+            rescaled = self.extendLimit(scoresAxis.get_ylim, scoresAxis.set_ylim, top) or rescaled
+
+        if rescaled or self.liveBackground is None:
+            # Redibujar la figura cuando Tk esté libre; saveLiveBackground
+            # guarda el nuevo fondo
+            self.liveCanvas.draw_idle()
+        else:
+            self.liveCanvas.restore_region(self.liveBackground)
+            self.drawLiveArtists()
+            self.liveCanvas.blit(self.liveFigure.bbox)
+
+    def finishSimulation(self, games):
+        """
+        Carga los juegos de la simulación terminada o cancelada.
+
+        Args:
+            games (GameIndex): Índice de los juegos simulados.
+        """
+        self.cancelButton.config(state=tk.DISABLED)
+        status = "Cancelada" if self.worker.monteCarlo.cancelled else "Terminada"
+        self.progressLabel.config(text=status + ": " + self.progressLabel.cget("text"))
+        self.games = games
+        self.applyFilters()
+
+    def cancelSimulation(self):
+        self.worker.cancel()
+        self.cancelButton.config(state=tk.DISABLED)
+        self.progressLabel.config(text="Cancelando...")
+
+    def applyFilters(self):
+        """
+        Recalcula las filas visibles con los filtros elegidos y vuelve a la
+        primera página.
+        """
+        team = self.teamFilter.get()
+        gender = next((key for key, label in self.genderLabels.items() if label == self.genderFilter.get()), None)
+        self.rows = self.games.filter(None if team == self.allLabel else team, gender)
+        self.showPage(0)
+
+    def getPageCount(self):
+        return max(1, -(-len(self.rows) // self.pageSize))
+
+    def showPage(self, page):
+        """
+        Llena la lista con las filas de una página.
+
+        Args:
+            page (int): Página a mostrar; se ajusta al rango válido.
+        """
+        self.page = min(max(page, 0), self.getPageCount() - 1)
+        self.gameList.delete(*self.gameList.get_children())
+        rows = self.rows[self.page * self.pageSize:(self.page + 1) * self.pageSize]
+        columns = self.games.columns
+        genders = self.games.getWinnerGenders(rows)
+        for row, gender in zip(rows.tolist(), genders.tolist()):
+            self.gameList.insert("", tk.END, iid=str(row),
+                                 values=(int(columns["game"][row]), self.games.letters[int(columns["winnerTeam"][row])],
+                                         self.genderLabels[gender], int(columns["roundsWonW"][row]),
+                                         int(columns["roundsWonM"][row])))
+        self.pageLabel.config(text=f"Página {self.page + 1} de {self.getPageCount()} ({len(self.rows)} juegos)")
+
+    def jumpToGame(self):
+        """
+        Muestra la página del juego escrito en el campo de búsqueda y lo
+        selecciona; si los filtros lo ocultan, se quitan.
+        """
+        try:
+            row = self.games.findRow(int(self.jumpEntry.get()))
+        except ValueError:
+            row = None
+        if row is None:
+            self.winnerLabel.config(text="No se encontró el juego " + self.jumpEntry.get())
+            return
+        position = int(self.rows.searchsorted(row))
+        if position == len(self.rows) or self.rows[position] != row:
+            self.teamFilter.set(self.allLabel)
+            self.genderFilter.set(self.allLabel)
+            self.rows = self.games.filter()
+            position = row
+        self.showPage(position // self.pageSize)
+        self.gameList.selection_set(str(row))
+        self.gameList.see(str(row))
+
     def start_graph(self):
         """
-        Método para mostrar información y gráficas del juego seleccionado en el combo box.
+        Método para mostrar información y gráficas del juego seleccionado en la lista.
+        Si no hay ninguno seleccionado, por ejemplo al cambiar de página, se
+        limpian las etiquetas y las barras.
         """
-        selectedGame = self.gameComboBox.get()
-        aux = selectedGame.split(" ")
-        actualGame = next((game for game in self.games if game.id == int(aux[1])), None)
-        if actualGame:
-            # Obtener los scoreByGame de los jugadores del actualGame
-            scoreByGameTeamA = [player.scoreByGame for player in actualGame.teams[0].players]
-            scoreByGameTeamB = [player.scoreByGame for player in actualGame.teams[1].players]
+        selection = self.gameList.selection()
+        if selection:
+            actualGame = self.games.getRecord(int(selection[0]))
 
             # Mostrar el equipo ganador
-            winner = "Empate" if actualGame.actualWinnerTeam == "" else f"Equipo ganador: {actualGame.actualWinnerTeam.letter}"
+            winner = "Empate" if actualGame.winnerTeam == "" else f"Equipo ganador: {actualGame.winnerTeam}"
             self.winnerLabel.config(text=winner)
 
             # Mostrar al jugador ganador
-            winnerPlayer = actualGame.winnerPlayer
-            self.winnerPlayerLabel.config(text="El jugador ganador fue: " + winnerPlayer.id)
+            self.winnerPlayerLabel.config(text="El jugador ganador fue: " + actualGame.winnerPlayer)
 
             # Mostrar al jugador con más suerte
-            luckiestOne = actualGame.luckiestPlayer
-            self.luckiestLabel.config(text="El jugador con más suerte: " + luckiestOne.id)
+            self.luckiestLabel.config(text="El jugador con más suerte: " + actualGame.luckiestPlayer)
 
             # Mostrar al jugador con más experiencia
-            mostXP = actualGame.playerWithMostXP
-            self.mostExperienceLabel.config(text="El jugador con más experiencia: " + mostXP.id)
-
-            # Obtener los nombres de los jugadores
-            playerNamesA = [f"Jugador {i+1}" for i in range(len(scoreByGameTeamA))]
-            playerNamesB = [f"Jugador {i+1}" for i in range(len(scoreByGameTeamB))]
-
-            # Crear la figura y los subplots para las dos gráficas
-            fig, axs = plt.subplots(2)
-
-            # Graficar los scoreByGame del equipo A
-            axs[0].bar(playerNamesA, scoreByGameTeamA)
-            axs[0].set_title("Score por juego - Equipo A")
-            axs[0].set_xlabel("Jugador")
-            axs[0].set_ylabel("Score")
-
-            # Graficar los scoreByGame del equipo B
-            axs[1].bar(playerNamesB, scoreByGameTeamB)
-            axs[1].set_title("Score por juego - Equipo B")
-            axs[1].set_xlabel("Jugador")
-            axs[1].set_ylabel("Score")
+            self.mostExperienceLabel.config(text="El jugador con más experiencia: " + actualGame.playerWithMostXP)
 
-            # Ajustar el espacio entre subplots
-            plt.tight_layout()
+            # Actualizar las barras con los scoreByGame de los jugadores del actualGame
+            top = max(max(scores) for scores in actualGame.scoreByGame)
+            for bars, labels, scores in zip(self.scoreBars, self.scoreLabels, actualGame.scoreByGame):
+                for bar, label, score in zip(bars, labels, scores):
+                    bar.set_height(score)
+                    label.set_y(score)
+                    label.set_text(str(score))
+                bars[0].axes.set_ylim(0, max(top, 1) * 1.15)
 
-            # Mostrar las gráficas
-            plt.show()
+            # Redibujar la figura cuando Tk esté libre
+            self.canvas.draw_idle()
         else:
-            print("No se encontró el juego seleccionado.")
+            for label in (self.winnerLabel, self.winnerPlayerLabel, self.luckiestLabel, self.mostExperienceLabel):
+                label.config(text="")
+            for bars, labels in zip(self.scoreBars, self.scoreLabels):
+                for bar, label in zip(bars, labels):
+                    bar.set_height(0)
+                    label.set_y(0)
+                    label.set_text("")
+            self.canvas.draw_idle()
@@ -1,59 +1,445 @@
-import matplotlib.pyplot as plt
+import os
 import sys
 import copy
-import tkinter as tk
-from tkinter import ttk
+import pickle
+import csv
+import json
+import time
+import argparse
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
+
+import taller_sc as pse
 from Game import Game
+from GameRecord import GameRecord
+from AggregateResults import AggregateResults
+from ConvergenceMonitor import ConvergenceMonitor
+from Profiler import Profiler
+from ResultsStore import ResultsStore
+from SimulationConfig import SimulationConfig
 from Team import Team
-from MainWindow import MainWindow
+from VectorEngine import VectorEngine
 
 class Montecarlo:
     """
     Clase que representa un simulador de juegos Montecarlo.
     """
 
-    def __init__(self):
+    def __init__(self, liveEvery=100, liveIntervalMs=500, maxPlotPoints=1000, resultsPath=None, fastTurns=False,
+                 checkpointPath=None, checkpointEvery=1000, checkpointSeconds=None, appendResults=False, config=None,
+                 progress=None, aggregate=False):
         """
         Inicializa un nuevo simulador Montecarlo.
+
+        Args:
+            liveEvery (int): Juegos entre avisos de avance.
+            liveIntervalMs (int): Milisegundos tras los cuales se avisa aunque
+                no se hayan completado liveEvery juegos (None para ignorarlo).
+            maxPlotPoints (int): Máximo de puntos por jugador de la
+                trayectoria de getTrajectory; los historiales más largos se
+                submuestrean.
+            resultsPath (str): Opcional, directorio de un ResultsStore donde
+                se escribe cada juego al terminar.
+            fastTurns (bool): Si es True, los juegos usan Round.playFastTurn,
+                que consume menos números aleatorios por turno.
+            checkpointPath (str): Opcional, archivo donde se guardan puntos de
+                control para continuar la simulación con resumeSimulation;
+                los juegos y el historial de puntuaciones van aparte, en
+                checkpointPath + ".history".
+            checkpointEvery (int): Juegos entre puntos de control.
+            checkpointSeconds (float): Opcional, segundos tras los cuales se
+                guarda un punto de control aunque no se completen
+                checkpointEvery juegos.
+            appendResults (bool): Si es True se conservan las filas que ya
+                tenga el ResultsStore de resultsPath.
+            config (SimulationConfig): Opcional, parámetros de los equipos,
+                los juegos y las tablas de puntuación.
+            progress (callable): Opcional, recibe el diccionario de
+                getProgress cada liveEvery juegos o liveIntervalMs
+                milisegundos, y al terminar la simulación.
+            aggregate (bool): Si es True no se guardan los juegos ni el
+                historial de puntuaciones, sino AggregateResults, cuya
+                memoria no crece con el número de juegos.
         """
+        self.config = config or SimulationConfig()
         self.teams = []
-        self.teams.append(Team("A"))
-        self.teams.append(Team("B"))
+        self.teams.append(Team("A", 0, self.config))
+        self.teams.append(Team("B", 1, self.config))
         self.winsByGender = {"W": 0, "M": 0}
         self.scoresHistory = []
         self.games = []
+        self.gameCount = 0
+        self.aggregates = AggregateResults(self.teams, self.config, maxPlotPoints) if aggregate else None
+        self.results = ResultsStore(resultsPath, len(self.teams), len(self.teams[0].players), append=appendResults) if resultsPath else None
+        self.fastTurns = fastTurns
+        self.liveEvery = liveEvery
+        self.liveIntervalMs = liveIntervalMs
+        self.maxPlotPoints = maxPlotPoints
+        self.progress = progress
+        self.lastProgressGame = 0
+        self.lastProgressTime = time.perf_counter()
+        self.cancelled = False
+        self.checkpointPath = checkpointPath
+        self.checkpointEvery = checkpointEvery
+        self.checkpointSeconds = checkpointSeconds
+        self.lastCheckpointGame = 0
+        self.lastCheckpointTime = time.perf_counter()
+        self.historyGames = 0
+        self.historyBytes = 0
+        self.targetGames = 0
+        self.simulationOptions = None
+        self.randomState = None
+        self.convergence = None
 
-        # Configurar la figura y los ejes para las gráficas
-        self.fig, (self.ax1, self.ax2) = plt.subplots(1, 2, figsize=(10, 5))
+    def startSimulation(self, nGames=None, workers=1, engine="objects", seed=None, batchSize=10000, stopping=None):
+        """
+        Inicia una nueva simulación Montecarlo, creando config.games juegos
+        (20000 por defecto).
 
-        # Configurar la gráfica de barras para winsByGender
-        self.ax1.bar(self.winsByGender.keys(), self.winsByGender.values())
-        self.ax1.set_xlabel('Género')
-        self.ax1.set_ylabel('Victorias')
-        self.ax1.set_title('Victorias por Género')
+        Realiza dos juegos y cuenta las victorias por género.
 
-        # Configurar la gráfica para el historial de puntuaciones por jugador
-        self.ax2.set_xlabel('Juego')
-        self.ax2.set_ylabel('Puntuación final')
-        self.ax2.set_title('Historial de puntuaciones por jugador')
+        Args:
+            nGames (int): Opcional, número de juegos a simular en lugar de
+                config.games.
+            workers (int): Número de procesos; con más de uno los juegos se
+                reparten con startParallelSimulation. El motor vectorial
+                corre en un solo proceso.
+            engine (str): "objects" simula cada juego con Game y Round;
+                "vector" simula lotes de juegos con VectorEngine.
+            seed (int): Opcional, semilla del generador de VectorEngine.
+            batchSize (int): Juegos por lote de VectorEngine.
+            stopping (ConvergenceMonitor): Opcional, detiene la simulación
+                antes de nGames juegos cuando las estimaciones alcanzan la
+                precisión pedida; con el motor vectorial se revisa al final
+                de cada lote.
 
-    def startSimulation(self):
+        La simulación también termina antes si se llama a cancel, por
+        ejemplo desde otro hilo, incluso antes de empezar; se revisa antes
+        de cada juego o lote, no en modo paralelo. El aviso de cancelación
+        se conserva hasta que se cree otro simulador.
         """
-        Inicia una nueva simulación Montecarlo, creando 20000 juegos.
+        if engine == "vector" and workers > 1:
+            raise ValueError("El motor vectorial no reparte los juegos entre procesos; use un solo proceso")
+        if (self.checkpointPath is not None or stopping is not None) and workers > 1:
+            raise ValueError("Los puntos de control y la parada por convergencia no están disponibles en modo paralelo")
+        if self.aggregates is not None and workers > 1:
+            raise ValueError("Los resultados agregados no están disponibles en modo paralelo")
+        if nGames is None:
+            nGames = self.config.games
+        self.targetGames = self.gameCount + nGames
+        self.simulationOptions = {"engine": engine, "batchSize": batchSize}
+        if stopping is not None:
+            maxGames = min(nGames, stopping.maxGames - stopping.games)
+            if stopping.getRequiredGames() > stopping.games + maxGames:
+                warnings.warn(f"Con un semiancho de {stopping.targets['proportion']} una proporción cercana a 0.5 necesita "
+                              f"unos {stopping.getRequiredGames()} juegos, más que los {stopping.games + maxGames} "
+                              "permitidos; la simulación probablemente no se detendrá antes")
+            stopping.start(self.teams)
+            self.convergence = stopping
+        if engine == "vector":
+            self.startVectorSimulation(nGames, seed, batchSize, stopping)
+        elif workers > 1:
+            self.startParallelSimulation(nGames, workers)
+        else:
+            for i in range(0, nGames):
+                if self.cancelled:
+                    break
+                game = Game(self.teams, self.gameCount + 1, self.fastTurns, self.config)
+                game.simulateGame()
+                record = GameRecord.fromGame(game)
+                self.gameCount += 1
+                self.increaseWinsByGender(game.winsByGender)
+                self.teams = game.teams
+                finalScores = self.getFinalScores()
+                if self.aggregates is not None:
+                    self.aggregates.add(record, finalScores, game.statsByPlayer)
+                else:
+                    self.games.append(record)
+                    self.updateScoresHistory(finalScores)
+                if self.results is not None:
+                    self.results.append(record, finalScores, game.statsByPlayer)
+                if self.progress is not None:
+                    self.reportProgress()
+                stop = stopping is not None and stopping.update(record)
+                self.checkpointIfDue()
+                if stop:
+                    break
+        if self.results is not None:
+            self.results.flush()
+        if self.checkpointPath is not None:
+            self.saveCheckpoint()
+        if self.progress is not None:
+            self.reportProgress(force=True)
 
-        Realiza dos juegos y cuenta las victorias por género.
+    def startParallelSimulation(self, nGames, workers):
+        """
+        Reparte los juegos en bloques consecutivos, uno por proceso.
+
+        Cada bloque usa su propio subflujo de números aleatorios
+        (pse.MonteCarloStream.split), por lo que la misma cantidad de juegos
+        y de procesos siempre da el mismo resultado. Todos los bloques parten
+        del estado actual de los equipos; al terminar, los contadores que se
+        acumulan entre juegos se suman en el orden de los bloques.
+
+        Dentro de un bloque las rondas se deciden con el score acumulado del
+        bloque, sin el de los anteriores, así que sus ganadores no son los
+        de una simulación en serie. Por eso cada bloque devuelve el score de
+        los equipos en cada ronda, y al unirlos se vuelven a calcular los
+        ganadores de las rondas y de los juegos con el score acumulado en el
+        orden de los bloques (VectorEngine.getWinnerTeams). Lo demás de cada
+        juego no depende del equipo que gana.
+
+        Args:
+            nGames (int): Número de juegos a simular.
+            workers (int): Número de procesos.
+        """
+        shardSizes = [nGames // workers + (1 if i < nGames % workers else 0) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            firstGameId = self.gameCount + 1
+            for i, size in enumerate(shardSizes):
+                futures.append(executor.submit(simulateShard, self.teams, firstGameId, size, pse.numbersMonteCarlo.seeds, i, workers,
+                                              self.fastTurns, self.config))
+                firstGameId += size
+            results = [future.result() for future in futures]
+
+        initialTeams = copy.deepcopy(self.teams)
+        letters = [team.letter for team in self.teams]
+        for games, scoresHistory, statsHistory, teamScoreByRound, teams in results:
+            teamScore, winnerTeam = VectorEngine.getWinnerTeams(self.teams, teamScoreByRound)
+            games = [game._replace(winnerTeam=letters[winner]) for game, winner in zip(games, winnerTeam.tolist())]
+            offsetsA = [player.finalScore - initial.finalScore for player, initial in zip(self.teams[0].players, initialTeams[0].players)]
+            offsetsB = [player.finalScore - initial.finalScore for player, initial in zip(self.teams[1].players, initialTeams[1].players)]
+            for game, (scoresTeamA, scoresTeamB), statsByPlayer in zip(games, scoresHistory, statsHistory):
+                self.games.append(game)
+                self.gameCount += 1
+                self.increaseWinsByGender({"W": game.roundsWonW, "M": game.roundsWonM})
+                self.scoresHistory.append(([score + offset for score, offset in zip(scoresTeamA, offsetsA)],
+                                           [score + offset for score, offset in zip(scoresTeamB, offsetsB)]))
+                if self.results is not None:
+                    self.results.append(game, self.scoresHistory[-1], statsByPlayer)
+            self.mergeTeams(initialTeams, teams, np.bincount(winnerTeam, minlength=len(letters)))
+
+    def startVectorSimulation(self, nGames, seed=None, batchSize=10000, stopping=None):
         """
-        for i in range(0, 20000):
-            game = Game(self.teams, i + 1)
-            game.simulateGame()
-            self.games.append(copy.deepcopy(game))
-            self.increaseWinsByGender(game.winsByGender)            
-            self.updateWinsByGenderGraph()
-            self.teams = game.teams
-            self.updateScoresHistory()
-            self.plotScores(self.ax2)
-        plt.show(block=True)
+        Simula los juegos por lotes con VectorEngine, en un solo proceso.
+
+        Args:
+            nGames (int): Número de juegos a simular.
+            seed (int): Opcional, semilla del generador de números aleatorios;
+                sin ella se continúa el generador de la simulación anterior o
+                del punto de control cargado, si lo hay.
+            batchSize (int): Juegos por lote.
+            stopping (ConvergenceMonitor): Opcional, se revisa tras cada lote.
+        """
+        engine = VectorEngine(self.teams, seed=seed, config=self.config)
+        if seed is None and self.randomState is not None:
+            engine.generator.bit_generator.state = self.randomState
+        for start in range(0, nGames, batchSize):
+            if self.cancelled:
+                break
+            firstGameId = self.gameCount + 1
+            batch = engine.simulateBatch(min(batchSize, nGames - start))
+            self.gameCount += len(batch["winnerTeam"])
+            self.winsByGender["W"] += int((batch["roundsWonW"] > batch["roundsWonM"]).sum())
+            self.winsByGender["M"] += int((batch["roundsWonM"] > batch["roundsWonW"]).sum())
+            if self.aggregates is not None:
+                self.aggregates.addBatch(dict(batch, game=np.arange(firstGameId, self.gameCount + 1)))
+            else:
+                self.games.extend(GameRecord.fromBatch(batch, self.teams, firstGameId))
+                self.scoresHistory.extend((scoresTeamA, scoresTeamB) for scoresTeamA, scoresTeamB in batch["finalScore"].tolist())
+            if self.results is not None:
+                columns = dict(batch, game=np.arange(firstGameId, self.gameCount + 1))
+                nPlayers = len(self.teams[0].players)
+                for name in ("winnerPlayer", "luckiestPlayer", "playerWithMostXP"):
+                    columns[name] = batch[name][:, 0] * nPlayers + batch[name][:, 1]
+                self.results.appendBatch(columns)
+            if self.progress is not None:
+                self.reportProgress()
+            self.randomState = engine.generator.bit_generator.state
+            stop = stopping is not None and stopping.updateBatch(batch)
+            self.checkpointIfDue()
+            if stop:
+                break
+
+    def checkpointIfDue(self):
+        """
+        Guarda un punto de control si pasaron checkpointEvery juegos o
+        checkpointSeconds segundos desde el último.
+        """
+        if self.checkpointPath is None:
+            return
+        due = self.checkpointEvery is not None and self.gameCount - self.lastCheckpointGame >= self.checkpointEvery
+        if not due and self.checkpointSeconds is not None:
+            due = time.perf_counter() - self.lastCheckpointTime >= self.checkpointSeconds
+        if due:
+            self.saveCheckpoint()
+
+    def saveCheckpoint(self):
+        """
+        Guarda en checkpointPath lo necesario para continuar la simulación
+        exactamente donde va: la posición del flujo de números aleatorios,
+        los equipos con sus jugadores, las victorias por género, los
+        resultados agregados, la convergencia y las filas escritas en el
+        ResultsStore. El archivo se reemplaza de forma atómica.
+
+        Los juegos y el historial de puntuaciones se agregan a
+        checkpointPath + ".history" desde el punto de control anterior, así
+        que el costo de cada punto de control no crece con los juegos ya
+        simulados; el archivo principal guarda hasta qué byte del historial
+        es válido.
+        """
+        if self.results is not None:
+            self.results.flush()
+        self.saveHistory()
+        state = {"version": 3,
+                 "targetGames": self.targetGames,
+                 "simulationOptions": self.simulationOptions,
+                 "fastTurns": self.fastTurns,
+                 "config": self.config,
+                 "seeds": pse.numbersMonteCarlo.seeds,
+                 "consumed": pse.numbersMonteCarlo.consumed,
+                 "randomState": self.randomState,
+                 "teams": self.teams,
+                 "winsByGender": self.winsByGender,
+                 "gameCount": self.gameCount,
+                 "historyBytes": self.historyBytes,
+                 "aggregates": self.aggregates,
+                 "convergence": self.convergence,
+                 "resultsRows": self.results.rows if self.results is not None else None}
+        temporaryPath = self.checkpointPath + ".tmp"
+        with open(temporaryPath, "wb") as checkpoint:
+            pickle.dump(state, checkpoint, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaryPath, self.checkpointPath)
+        self.lastCheckpointGame = self.gameCount
+        self.lastCheckpointTime = time.perf_counter()
+
+    def saveHistory(self):
+        """
+        Agrega al historial del punto de control los juegos y puntuaciones
+        simulados desde el anterior, descartando lo que se haya escrito
+        después de él.
+        """
+        if len(self.games) == self.historyGames:
+            return
+        with open(self.checkpointPath + ".history", "r+b" if self.historyBytes else "wb") as history:
+            history.truncate(self.historyBytes)
+            history.seek(self.historyBytes)
+            pickle.dump((self.games[self.historyGames:], self.scoresHistory[self.historyGames:]), history,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            self.historyBytes = history.tell()
+        self.historyGames = len(self.games)
+
+    def loadHistory(self, path, historyBytes):
+        """
+        Lee los juegos y puntuaciones del historial de un punto de control.
+
+        Args:
+            path (str): Archivo del punto de control.
+            historyBytes (int): Bytes válidos del historial; lo que siga se
+                recorta.
+        """
+        self.games = []
+        self.scoresHistory = []
+        if historyBytes:
+            with open(path + ".history", "r+b") as history:
+                history.truncate(historyBytes)
+                while history.tell() < historyBytes:
+                    games, scoresHistory = pickle.load(history)
+                    self.games.extend(games)
+                    self.scoresHistory.extend(scoresHistory)
+        if path == self.checkpointPath:
+            self.historyGames = len(self.games)
+            self.historyBytes = historyBytes
+        else:
+            # El historial se vuelve a escribir completo en checkpointPath
+            self.historyGames = 0
+            self.historyBytes = 0
+
+    def loadCheckpoint(self, path=None):
+        """
+        Restaura el estado guardado por saveCheckpoint. El flujo global de
+        números aleatorios se reconstruye con las semillas guardadas y se
+        adelanta hasta la misma posición; el ResultsStore se recorta a las
+        filas que tenía en el punto de control, y el historial a los juegos
+        que tenía.
+
+        Args:
+            path (str): Opcional, archivo del punto de control; por defecto
+                checkpointPath.
+        """
+        path = path or self.checkpointPath
+        with open(path, "rb") as checkpoint:
+            state = pickle.load(checkpoint)
+        self.targetGames = state["targetGames"]
+        self.simulationOptions = state["simulationOptions"]
+        self.fastTurns = state["fastTurns"]
+        self.config = state["config"]
+        self.randomState = state["randomState"]
+        self.teams = state["teams"]
+        self.winsByGender = state["winsByGender"]
+        self.loadHistory(path, state["historyBytes"])
+        self.gameCount = state["gameCount"]
+        self.aggregates = state.get("aggregates")
+        self.convergence = state["convergence"]
+        pse.numbersMonteCarlo = pse.generateNumbersForMonteCarlo(seeds=state["seeds"])
+        pse.numbersMonteCarlo.skip(state["consumed"])
+        if self.results is not None and state["resultsRows"] is not None:
+            self.results.truncate(state["resultsRows"])
+        self.lastCheckpointGame = self.gameCount
+        self.lastCheckpointTime = time.perf_counter()
+
+    def resumeSimulation(self, path=None):
+        """
+        Continúa desde un punto de control la simulación que lo guardó, hasta
+        completar el número de juegos que tenía como objetivo. El resultado
+        es idéntico al de la simulación sin interrumpir.
+
+        Args:
+            path (str): Opcional, archivo del punto de control; por defecto
+                checkpointPath.
+        """
+        self.loadCheckpoint(path)
+        options = self.simulationOptions
+        convergence = self.convergence
+        if convergence is not None and (convergence.converged or convergence.games >= convergence.maxGames):
+            return
+        self.startSimulation(self.targetGames - self.gameCount, 1, options["engine"], None, options["batchSize"],
+                             self.convergence)
+
+    @staticmethod
+    def getProfiledPhases():
+        """
+        Fases de Montecarlo que mide Profiler, con el formato de
+        Profiler.phases.
+        """
+        return [(Montecarlo, "startSimulation", "simulation", False),
+                (Montecarlo, "updateScoresHistory", "scoresHistory", False)]
+
+    def mergeTeams(self, initialTeams, shardTeams, gamesWon):
+        """
+        Suma a los equipos lo que un bloque acumuló desde initialTeams.
+
+        Los equipos del bloque pasan a ser los equipos actuales, con los
+        contadores acumulados (score y finalGameWon del equipo, finalScore y
+        finalWonRound de los jugadores) reemplazados por el total combinado.
+
+        Args:
+            initialTeams (list): Equipos al inicio de la simulación.
+            shardTeams (list): Equipos al terminar el bloque.
+            gamesWon (ndarray): Juegos del bloque que ganó cada equipo, ya
+                recalculados en el orden de los bloques; reemplazan a los
+                que contó el bloque.
+        """
+        for team, initial, shardTeam, won in zip(self.teams, initialTeams, shardTeams, gamesWon.tolist()):
+            shardTeam.score = team.score + shardTeam.score - initial.score
+            shardTeam.finalGameWon = team.finalGameWon + won
+            for player, initialPlayer, shardPlayer in zip(team.players, initial.players, shardTeam.players):
+                shardPlayer.finalScore = player.finalScore + shardPlayer.finalScore - initialPlayer.finalScore
+                shardPlayer.finalWonRound = player.finalWonRound + shardPlayer.finalWonRound - initialPlayer.finalWonRound
+        self.teams = shardTeams
 
     def increaseWinsByGender(self, winsByGender):
         """
@@ -68,55 +454,364 @@ class Montecarlo:
             self.winsByGender[max_gender] += 1
 
     
-    def updateScoresHistory(self):
+    def getFinalScores(self):
+        """
+        Returns:
+            tuple: Por equipo, la lista del score final acumulado de sus
+            jugadores.
+        """
+        return tuple([player.finalScore for player in team.players] for team in self.teams)
+
+    def updateScoresHistory(self, finalScores=None):
         """
         Actualiza el historial de puntuaciones de los jugadores después de cada juego.
+
+        Args:
+            finalScores (tuple): Opcional, el resultado de getFinalScores.
         """
-        scoresTeamA = [player.finalScore for player in self.teams[0].players]
-        scoresTeamB = [player.finalScore for player in self.teams[1].players]
-        self.scoresHistory.append((scoresTeamA, scoresTeamB))
+        self.scoresHistory.append(finalScores or self.getFinalScores())
 
-    def updateWinsByGenderGraph(self):
+    def isRefreshDue(self, lastGame, lastTime):
         """
-        Actualiza y muestra la gráfica de barras para winsByGender.
+        Returns:
+            bool: True si desde lastGame y lastTime pasaron liveEvery juegos
+            o liveIntervalMs milisegundos.
         """
-        self.ax1.clear()
-        self.ax1.bar(self.winsByGender.keys(), self.winsByGender.values())
-        self.ax1.set_xlabel('Género')
-        self.ax1.set_ylabel('Victorias')
-        self.ax1.set_title('Victorias por Género')
+        if self.gameCount - lastGame >= self.liveEvery:
+            return True
+        return self.liveIntervalMs is not None and (time.perf_counter() - lastTime) * 1000 >= self.liveIntervalMs
 
-        # Actualizar la gráfica
-        self.fig.canvas.draw()
-        plt.pause(0.01)
-    
-    def plotScores(self, ax):
-        """
-        Grafica el historial de puntuaciones de los jugadores después de cada juego.
-        """
-        ax.clear()
-        numPlayers = len(self.teams[0].players)
-        for i in range(numPlayers):
-            playerScoresTeamA = [game_scores[0][i] for game_scores in self.scoresHistory]
-            playerScoresTeamB = [game_scores[1][i] for game_scores in self.scoresHistory]
-            ax.plot(range(1, len(playerScoresTeamA) + 1), playerScoresTeamA, label=f"Team A - Player {i+1}")
-            ax.plot(range(1, len(playerScoresTeamB) + 1), playerScoresTeamB, label=f"Team B - Player {i+1}")
-
-        ax.set_xlabel("Juego")
-        ax.set_ylabel("Puntuación final")
-        ax.set_title("Historial de puntuaciones por jugador")
-        ax.legend()
-        ax.grid(True)
-        plt.draw()
-
-def main():
+    def reportProgress(self, force=False):
+        """
+        Pasa getProgress a progress si ya pasaron liveEvery juegos o
+        liveIntervalMs milisegundos desde el último aviso.
+
+        Args:
+            force (bool): Opcional, avisa aunque no toque todavía.
+        """
+        if not (force or self.isRefreshDue(self.lastProgressGame, self.lastProgressTime)):
+            return
+        self.lastProgressGame = self.gameCount
+        self.lastProgressTime = time.perf_counter()
+        self.progress(self.getProgress())
+
+    def getProgress(self):
+        """
+        Devuelve el avance de la simulación en curso, con copias que se
+        pueden leer desde otro hilo.
+
+        Returns:
+            dict: Juegos simulados y objetivo, si se canceló, victorias por
+            género, juegos ganados por equipo, score medio por juego de
+            cada jugador y su trayectoria (getTrajectory).
+        """
+        games = self.gameCount
+        return {"games": games,
+                "targetGames": self.targetGames,
+                "cancelled": self.cancelled,
+                "winsByGender": dict(self.winsByGender),
+                "gamesWonByTeam": {team.letter: team.finalGameWon for team in self.teams},
+                "meanScoreByGame": {player.id: player.finalScore / max(games, 1)
+                                    for team in self.teams for player in team.players},
+                "trajectory": self.getTrajectory()}
+
+    def getTrajectory(self):
+        """
+        Score final acumulado de cada jugador a lo largo de la simulación.
+
+        Si el historial tiene más de maxPlotPoints juegos se toma uno de cada
+        tantos (siempre incluyendo el último), así que el costo no crece con
+        la simulación.
+
+        Returns:
+            tuple: Juegos de la trayectoria y, por equipo, el score final
+            acumulado de sus jugadores en esos juegos, de forma
+            (equipos, puntos, jugadores).
+        """
+        if self.aggregates is not None:
+            return self.aggregates.getTrajectory()
+        total = len(self.scoresHistory)
+        step = max(1, -(-total // self.maxPlotPoints))
+        indices = list(range(0, total, step))
+        if total > 0 and indices[-1] != total - 1:
+            indices.append(total - 1)
+        scores = np.array([self.scoresHistory[index] for index in indices], dtype=np.int64)
+        scores = scores.reshape(len(indices), len(self.teams), len(self.teams[0].players))
+        return np.array(indices, dtype=np.int64) + 1, scores.transpose(1, 0, 2)
+
+    def cancel(self):
+        """
+        Pide terminar la simulación en curso después del juego o lote
+        actual; lo ya simulado se conserva.
+        """
+        self.cancelled = True
+
+    def getGameResults(self):
+        """
+        Resume cada juego simulado en un diccionario plano.
+
+        Returns:
+            list: Un diccionario por juego con el equipo ganador, las rondas
+            ganadas por género, los jugadores destacados, el score por juego
+            y el score final acumulado de cada jugador.
+        """
+        results = []
+        for game, scores in zip(self.games, self.scoresHistory):
+            result = {"game": game.id,
+                      "winnerTeam": game.winnerTeam,
+                      "roundsWonW": game.roundsWonW,
+                      "roundsWonM": game.roundsWonM,
+                      "winnerPlayer": game.winnerPlayer,
+                      "luckiestPlayer": game.luckiestPlayer,
+                      "playerWithMostXP": game.playerWithMostXP}
+            for team, teamScores in zip(self.teams, game.scoreByGame):
+                for player, score in zip(team.players, teamScores):
+                    result["scoreByGame" + player.id] = score
+            for team, teamScores in zip(self.teams, scores):
+                for player, score in zip(team.players, teamScores):
+                    result["finalScore" + player.id] = score
+            results.append(result)
+        return results
+
+    def getSummary(self):
+        """
+        Devuelve los resultados agregados de la simulación.
+
+        Returns:
+            dict: Juegos simulados, victorias por género, juegos ganados por
+            equipo y score final de cada jugador; con parada por
+            convergencia, también sus intervalos de confianza, y con
+            resultados agregados, sus estadísticas.
+        """
+        summary = {"games": self.gameCount,
+                   "winsByGender": dict(self.winsByGender),
+                   "gamesWonByTeam": {team.letter: team.finalGameWon for team in self.teams},
+                   "finalScore": {player.id: player.finalScore for team in self.teams for player in team.players}}
+        if self.convergence is not None:
+            summary["convergence"] = self.convergence.getReport()
+        if self.aggregates is not None:
+            summary["aggregates"] = self.aggregates.getReport()
+        return summary
+
+
+def writeResults(monteCarlo, path, outputFormat, elapsed=None):
+    """
+    Escribe los resultados agregados y por juego de una simulación.
+
+    En formato json se escribe un único archivo con las claves "summary" y
+    "games". En formato csv el archivo tiene una fila por juego y el resumen
+    se escribe aparte en <path>.summary.json.
+
+    Args:
+        monteCarlo (Montecarlo): Simulador con los juegos ya simulados.
+        path (str): Ruta del archivo de salida.
+        outputFormat (str): "json" o "csv".
+        elapsed (float): Opcional, segundos que tomó la simulación.
+    """
+    summary = monteCarlo.getSummary()
+    if elapsed is not None:
+        summary["elapsedSeconds"] = elapsed
+    games = monteCarlo.getGameResults()
+    if outputFormat == "json":
+        with open(path, "w") as output:
+            json.dump({"summary": summary, "games": games}, output, indent=2)
+        return
+    with open(path, "w", newline="") as output:
+        writer = csv.DictWriter(output, fieldnames=list(games[0].keys()) if games else ["game"])
+        writer.writeheader()
+        writer.writerows(games)
+    with open(path + ".summary.json", "w") as output:
+        json.dump(summary, output, indent=2)
+
+
+def simulateShard(teams, firstGameId, nGames, seeds, substream, nSubstreams, fastTurns=False, config=None):
+    """
+    Simula un bloque de juegos en un proceso de startParallelSimulation.
+
+    Args:
+        teams (list): Equipos al inicio del bloque.
+        firstGameId (int): Identificador del primer juego del bloque.
+        nGames (int): Número de juegos del bloque.
+        seeds (list): Semillas del flujo de números aleatorios.
+        substream (int): Subflujo de números aleatorios del bloque.
+        nSubstreams (int): Número total de subflujos.
+        fastTurns (bool): Opcional, los juegos usan Round.playFastTurn.
+        config (SimulationConfig): Opcional, parámetros de los juegos.
+
+    Returns:
+        tuple: Resúmenes de los juegos (GameRecord), historial de puntuaciones finales
+        después de cada juego, estadísticas de los jugadores en cada juego
+        (Game.statsByPlayer), el score de cada equipo en cada ronda (arreglo
+        de forma (juegos, rondas, equipos)) y los equipos al terminar el
+        bloque. El equipo ganador de los resúmenes y el finalGameWon de los
+        equipos solo cuentan el score del bloque; startParallelSimulation
+        los corrige.
+    """
+    pse.numbersMonteCarlo = pse.generateNumbersForMonteCarlo(seeds=seeds, substream=substream, nSubstreams=nSubstreams)
+    games = []
+    scoresHistory = []
+    statsHistory = []
+    teamScoreByRound = []
+    for i in range(0, nGames):
+        game = Game(teams, firstGameId + i, fastTurns, config)
+        game.simulateGame()
+        games.append(GameRecord.fromGame(game))
+        teams = game.teams
+        scoresHistory.append(([player.finalScore for player in teams[0].players],
+                              [player.finalScore for player in teams[1].players]))
+        statsHistory.append(game.statsByPlayer)
+        teamScoreByRound.append(game.teamScoreByRound)
+    teamScoreByRound = np.array(teamScoreByRound, dtype=np.int64).reshape(nGames, (config or SimulationConfig()).rounds, len(teams))
+    return games, scoresHistory, statsHistory, teamScoreByRound, teams
+
+def parseArguments(argv):
+    """
+    Lee las opciones de la línea de comandos.
+
+    Args:
+        argv (list): Argumentos sin el nombre del programa.
+
+    Returns:
+        argparse.Namespace: Opciones leídas.
+    """
+    parser = argparse.ArgumentParser(description="Simulador Montecarlo de arquería.")
+    parser.add_argument("--headless", action="store_true",
+                        help="simula sin gráficas ni ventana y escribe los resultados en un archivo")
+    parser.add_argument("--games", type=int, help="número de juegos (por defecto el de la configuración, 20000)")
+    parser.add_argument("--config",
+                        help="archivo JSON con los parámetros a cambiar de SimulationConfig, p. ej. {\"teamSize\": 6}")
+    parser.add_argument("--workers", type=int, default=1, help="número de procesos (por defecto 1)")
+    parser.add_argument("--seeds", help="archivo JSON con una lista de semillas [Xo, k, c, g, min, max, cantidad]")
+    parser.add_argument("--stream-workers", type=int,
+                        help="construye antes la cache de las semillas con este número de procesos y muestra su costo; "
+                             "con --workers, la de los subflujos de cada proceso")
+    parser.add_argument("--output", help="archivo de resultados (por defecto resultados.<formato>)")
+    parser.add_argument("--format", choices=["json", "csv"], default="json", help="formato de salida")
+    parser.add_argument("--engine", choices=["objects", "vector"], default="objects",
+                        help="motor de simulación: juego por juego o por lotes con NumPy")
+    parser.add_argument("--seed", type=int, help="semilla del generador del motor vectorial")
+    parser.add_argument("--batch-size", type=int, default=10000, help="juegos por lote del motor vectorial")
+    parser.add_argument("--fast-turns", action="store_true",
+                        help="toma el total de cada turno de una distribución precalculada")
+    parser.add_argument("--profile",
+                        help="mide las fases de la simulación y escribe el informe en este archivo (.json o .csv)")
+    parser.add_argument("--checkpoint", help="archivo de puntos de control para poder continuar la simulación")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="juegos entre puntos de control")
+    parser.add_argument("--checkpoint-seconds", type=float, help="o segundos entre puntos de control")
+    parser.add_argument("--resume", action="store_true",
+                        help="continúa desde --checkpoint la simulación interrumpida, con sus mismas opciones")
+    parser.add_argument("--converge", action="store_true",
+                        help="se detiene antes de --games juegos cuando las estimaciones alcanzan la precisión pedida")
+    parser.add_argument("--min-games", type=int, default=1000, help="juegos mínimos con --converge")
+    parser.add_argument("--proportion-width", type=float, default=0.01,
+                        help="semiancho máximo del intervalo de las proporciones de victorias; con 0.95 de "
+                             "confianza, 0.01 puede necesitar unos 9600 juegos y 0.005 unos 38400")
+    parser.add_argument("--score-width", type=float, default=2.0,
+                        help="semiancho máximo del intervalo del score medio por juego de cada jugador")
+    parser.add_argument("--confidence", type=float, default=0.95, help="nivel de confianza de los intervalos")
+    parser.add_argument("--check-every", type=int, default=100, help="juegos entre revisiones de la precisión")
+    parser.add_argument("--aggregate", action="store_true",
+                        help="guarda solo estadísticas de memoria fija en lugar de cada juego y el historial")
+    parser.add_argument("--store", help="directorio de un almacén columnar donde se escribe cada juego")
+    parser.add_argument("--live-every", type=int, default=100, help="refresca el avance cada N juegos")
+    parser.add_argument("--live-interval-ms", type=int, default=500, help="o cada T milisegundos")
+    arguments = parser.parse_args(argv)
+    if arguments.resume and not arguments.checkpoint:
+        parser.error("--resume necesita --checkpoint")
+    if arguments.workers > 1 and arguments.engine == "vector":
+        parser.error("--workers no aplica al motor vectorial, que corre en un solo proceso")
+    if arguments.stream_workers and arguments.engine == "vector":
+        parser.error("--stream-workers no aplica al motor vectorial, que no lee el flujo de las semillas")
+    return arguments
+
+def runSimulation(monteCarlo, arguments):
+    """
+    Inicia la simulación pedida en la línea de comandos, o la continúa
+    desde el punto de control con --resume.
+
+    Args:
+        monteCarlo (Montecarlo): Simulador.
+        arguments (argparse.Namespace): Opciones leídas.
+    """
+    if arguments.resume:
+        monteCarlo.resumeSimulation()
+    else:
+        stopping = None
+        if arguments.converge:
+            stopping = ConvergenceMonitor(arguments.proportion_width, arguments.score_width, arguments.confidence,
+                                          arguments.min_games, arguments.games or monteCarlo.config.games,
+                                          arguments.check_every)
+        monteCarlo.startSimulation(arguments.games, arguments.workers, arguments.engine, arguments.seed, arguments.batch_size,
+                                   stopping)
+
+def main(argv=None):
     """
     Función principal para iniciar el simulador Montecarlo.
+
+    Args:
+        argv (list): Opcional, argumentos de la línea de comandos.
     """
-    monteCarlo = Montecarlo()
-    monteCarlo.startSimulation()
+    arguments = parseArguments(sys.argv[1:] if argv is None else argv)
+    if arguments.seeds or arguments.stream_workers:
+        seeds = None
+        if arguments.seeds:
+            with open(arguments.seeds) as seedsFile:
+                seeds = json.load(seedsFile)
+        pse.numbersMonteCarlo = pse.generateNumbersForMonteCarlo(seeds=seeds)
+        if arguments.stream_workers:
+            # En modo paralelo cada proceso lee su subflujo, no el flujo completo
+            nSubstreams = arguments.workers if arguments.workers > 1 and not arguments.resume else None
+            pse.printSeedStats(pse.numbersMonteCarlo.prepare(arguments.stream_workers, nSubstreams))
+
+    config = None
+    if arguments.config:
+        with open(arguments.config) as configFile:
+            config = SimulationConfig.fromDict(json.load(configFile))
+
+    if arguments.profile:
+        Profiler.enable(Montecarlo.getProfiledPhases())
+
+    if arguments.headless:
+        monteCarlo = Montecarlo(resultsPath=arguments.store, fastTurns=arguments.fast_turns,
+                                checkpointPath=arguments.checkpoint, checkpointEvery=arguments.checkpoint_every,
+                                checkpointSeconds=arguments.checkpoint_seconds, appendResults=arguments.resume, config=config,
+                                aggregate=arguments.aggregate)
+        start = time.perf_counter()
+        runSimulation(monteCarlo, arguments)
+        elapsed = time.perf_counter() - start
+        output = arguments.output or "resultados." + arguments.format
+        writeResults(monteCarlo, output, arguments.format, elapsed)
+        if arguments.profile:
+            Profiler.disable().writeReport(arguments.profile)
+        print(f"{monteCarlo.gameCount} juegos en {elapsed:.1f} s -> {output}")
+        return
+
+    import tkinter as tk
+    from GameIndex import GameIndex
+    from MainWindow import MainWindow
+    from SimulationWorker import SimulationWorker
+
+    # La simulación corre en otro hilo; la ventana dibuja su avance
+    monteCarlo = Montecarlo(liveEvery=arguments.live_every, liveIntervalMs=arguments.live_interval_ms,
+                            resultsPath=arguments.store, fastTurns=arguments.fast_turns,
+                            checkpointPath=arguments.checkpoint, checkpointEvery=arguments.checkpoint_every,
+                            checkpointSeconds=arguments.checkpoint_seconds, appendResults=arguments.resume, config=config,
+                            aggregate=arguments.aggregate)
+
+    def finish(monteCarlo):
+        if arguments.profile:
+            Profiler.disable().writeReport(arguments.profile)
+        # Con --store la ventana lee los juegos del almacén en disco
+        if monteCarlo.results is not None:
+            return GameIndex.fromStore(arguments.store)
+        return GameIndex.fromRecords(monteCarlo.games)
+
+    # En modo paralelo la simulación no se puede cancelar
+    cancellable = arguments.resume or arguments.workers <= 1 or arguments.engine == "vector"
+    worker = SimulationWorker(monteCarlo, lambda monteCarlo: runSimulation(monteCarlo, arguments), finish, cancellable)
     app = tk.Tk()
-    window = MainWindow(app, monteCarlo.games)
+    window = MainWindow(app, GameIndex.fromRecords([], len(monteCarlo.teams), len(monteCarlo.teams[0].players)), worker)
+    worker.start()
     # No necesitas llamar a window.pack()
     window.lift()  # Opcional: mostrar la ventana al frente
     app.mainloop()
@@ -19,9 +19,15 @@ class Player:
             finalLuck (int): Nivel final de suerte alcanzado por el jugador.
             scoreByGame (int): Puntuación acumulada por el jugador en un juego.
             finalWonRound (int): Puntación de cada ronda ganada.
+            teamIndex (int): Posición del equipo del jugador en la lista de equipos.
+            index (int): Posición del jugador en la lista de jugadores de su equipo.
         """
 
-    def __init__(self, id, resistance, experience, gender):
+    __slots__ = ("id", "resistance", "experience", "luck", "gender", "initialExperience", "initialResistance",
+                 "score", "roundResistance", "consecutiveShot", "bufferExperience", "remainingRoundsOfBonus",
+                 "wonRound", "finalWonRound", "finalLuck", "scoreByGame", "finalScore", "teamIndex", "index")
+
+    def __init__(self, id, resistance, experience, gender, teamIndex, index):
         """
             Inicializa un objeto Player con los atributos dados.
 
@@ -30,6 +36,8 @@ class Player:
                 resistance (int): Resistencia inicial del jugador.
                 experience (int): Experiencia inicial del jugador.
                 gender (str): Género del jugador.
+                teamIndex (int): Posición del equipo del jugador.
+                index (int): Posición del jugador en su equipo.
         """
         self.id = id
         self.resistance = resistance
@@ -48,6 +56,8 @@ class Player:
         self.finalLuck = 0
         self.scoreByGame = 0
         self.finalScore = 0
+        self.teamIndex = teamIndex
+        self.index = index
 
 
     def readjustResistance(self, loss):
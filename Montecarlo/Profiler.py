@@ -0,0 +1,216 @@
+import csv
+import json
+import time
+
+
+class Profiler:
+    """
+    Instrumentación opcional de una simulación.
+
+    Profiler.enable() crea el perfilador activo y reemplaza los métodos de
+    las fases que se quieren medir (ver Profiler.phases) por versiones que
+    acumulan su tiempo; Profiler.disable() devuelve los originales. Mientras
+    no esté activo las clases conservan sus métodos sin cambios, así que la
+    simulación no paga nada por la instrumentación; fuera de esos métodos
+    solo taller_sc consulta Profiler.active, una vez por bloque entregado o
+    por semilla leída de la cache.
+
+    Además del tiempo por fase registra los números aleatorios consumidos
+    por ronda y por juego, la profundidad del desempate de
+    Round.checkScores y los bloques aceptados y rechazados por testNumbers.
+    Sin la cache de números validados los bloques se cuentan hasta el último
+    que se leyó; con ella se suman los de cada semilla leída completa, los
+    guardados con su archivo, aunque la cache ya existiera, y el contador
+    cachedSeeds dice cuántas semillas se contaron así.
+    En modo paralelo solo se mide el proceso principal.
+
+    Atributos:
+        active (Profiler): Perfilador activo, o None.
+        times (dict): Por fase, [llamadas, segundos].
+        counters (dict): Contadores por nombre.
+        distributions (dict): Por nombre, cuántas veces se observó cada valor.
+    """
+
+    active = None
+
+    def __init__(self):
+        """
+        Inicializa un perfilador vacío.
+        """
+        self.times = {}
+        self.counters = {}
+        self.distributions = {}
+        self.running = {}
+        self.originals = []
+        self.start = time.perf_counter()
+
+    @staticmethod
+    def phases():
+        """
+        Métodos que se miden, como (clase, método, fase, números por llamada).
+        Las fases de Montecarlo las agrega Montecarlo.getProfiledPhases, para
+        instrumentar la clase del módulo que se está ejecutando.
+
+        Returns:
+            list: Las fases instrumentadas; si el último elemento es True,
+            también se registran los números aleatorios que consume cada
+            llamada.
+        """
+        import taller_sc as pse
+        from Game import Game
+        from GameRecord import GameRecord
+        from ResultsStore import ResultsStore
+        from Round import Round
+        from VectorEngine import VectorEngine
+        return [(Game, "simulateGame", "game", True),
+                (Round, "simulateRound", "round", True),
+                (Round, "updateLuckAndBonus", "luckAndBonus", False),
+                (Round, "validateLuckiestShot", "luckiestShot", False),
+                (Round, "playRound", "playRound", False),
+                (Round, "getScore", "getScore", False),
+                (Round, "checkScores", "checkScores", False),
+                (GameRecord, "fromGame", "gameRecord", False),
+                (ResultsStore, "append", "resultsStore", False),
+                (ResultsStore, "appendBatch", "resultsStore", False),
+                (ResultsStore, "flush", "resultsStore", False),
+                (VectorEngine, "simulateBatch", "vectorBatch", False),
+                (pse.MonteCarloStream, "_fill", "streamFill", False)]
+
+    @classmethod
+    def enable(cls, extraPhases=()):
+        """
+        Activa un perfilador nuevo e instrumenta las fases.
+
+        Args:
+            extraPhases (list): Opcional, más fases con el formato de
+                Profiler.phases.
+
+        Returns:
+            Profiler: El perfilador activo.
+        """
+        cls.disable()
+        profiler = cls()
+        for owner, name, phase, countRandoms in cls.phases() + list(extraPhases):
+            profiler.instrument(owner, name, phase, countRandoms)
+        cls.active = profiler
+        return profiler
+
+    @classmethod
+    def disable(cls):
+        """
+        Devuelve los métodos originales y desactiva el perfilador activo.
+
+        Returns:
+            Profiler: El perfilador que estaba activo, o None.
+        """
+        profiler = cls.active
+        if profiler is not None:
+            for owner, name, original in reversed(profiler.originals):
+                setattr(owner, name, original)
+            profiler.originals = []
+        cls.active = None
+        return profiler
+
+    def instrument(self, owner, name, phase, countRandoms):
+        """
+        Reemplaza owner.name por una versión que mide su tiempo.
+
+        Las llamadas recursivas a una fase que ya está corriendo no se
+        cuentan dos veces; su profundidad se registra como
+        <fase>Depth.
+
+        Args:
+            owner (type): Clase del método.
+            name (str): Nombre del método.
+            phase (str): Fase en la que se acumula el tiempo.
+            countRandoms (bool): Si se registran los números consumidos.
+        """
+        import taller_sc as pse
+        original = owner.__dict__[name]
+        isClassMethod = isinstance(original, classmethod)
+        function = original.__func__ if isClassMethod else original
+        profiler = self
+
+        def timed(*args, **kwargs):
+            if phase in profiler.running:
+                profiler.running[phase] += 1
+                return function(*args, **kwargs)
+            profiler.running[phase] = 0
+            consumed = pse.numbersMonteCarlo.consumed
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.addTime(phase, time.perf_counter() - start)
+                depth = profiler.running.pop(phase)
+                if depth > 0 or phase == "checkScores":
+                    profiler.observe(phase + "Depth", depth)
+                if countRandoms:
+                    profiler.observe(phase + "Randoms", pse.numbersMonteCarlo.consumed - consumed)
+
+        timed.__name__ = function.__name__
+        timed.__doc__ = function.__doc__
+        self.originals.append((owner, name, original))
+        setattr(owner, name, classmethod(timed) if isClassMethod else timed)
+
+    def addTime(self, phase, seconds):
+        entry = self.times.setdefault(phase, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        values = self.distributions.setdefault(name, {})
+        values[value] = values.get(value, 0) + 1
+
+    def getReport(self):
+        """
+        Resume lo registrado.
+
+        Returns:
+            dict: Tiempo total, fases (llamadas, segundos, microsegundos por
+            llamada), contadores y distribuciones (cantidad, media, mínimo,
+            máximo e histograma).
+        """
+        phases = {}
+        for phase, (calls, seconds) in sorted(self.times.items(), key=lambda item: -item[1][1]):
+            phases[phase] = {"calls": calls,
+                             "seconds": seconds,
+                             "microsecondsPerCall": 1e6 * seconds / calls}
+        distributions = {}
+        for name, values in self.distributions.items():
+            count = sum(values.values())
+            distributions[name] = {"count": count,
+                                   "mean": sum(value * times for value, times in values.items()) / count,
+                                   "min": min(values),
+                                   "max": max(values),
+                                   "histogram": {str(value): values[value] for value in sorted(values)}}
+        return {"elapsedSeconds": time.perf_counter() - self.start,
+                "phases": phases,
+                "counters": dict(self.counters),
+                "distributions": distributions}
+
+    def writeReport(self, path):
+        """
+        Escribe el resumen en path; en CSV si termina en .csv y en JSON si no.
+
+        Args:
+            path (str): Ruta del archivo de salida.
+        """
+        report = self.getReport()
+        if not path.endswith(".csv"):
+            with open(path, "w") as output:
+                json.dump(report, output, indent=2)
+            return
+        with open(path, "w", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(["kind", "name", "count", "total", "mean", "min", "max"])
+            for phase, entry in report["phases"].items():
+                writer.writerow(["phase", phase, entry["calls"], entry["seconds"], entry["microsecondsPerCall"], "", ""])
+            for name, value in report["counters"].items():
+                writer.writerow(["counter", name, value, value, "", "", ""])
+            for name, entry in report["distributions"].items():
+                total = entry["mean"] * entry["count"]
+                writer.writerow(["distribution", name, entry["count"], total, entry["mean"], entry["min"], entry["max"]])
@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Boceto de cuantiles con error relativo acotado (como DDSketch) para
+    varias columnas de valores no negativos.
+
+    Cada valor positivo x cae en la cubeta ceil(log_gamma(x)), con
+    gamma = (1 + relativeAccuracy) / (1 - relativeAccuracy); los ceros se
+    cuentan aparte. Los cuantiles se devuelven con error relativo menor a
+    relativeAccuracy, y la memoria crece con el logaritmo del rango de los
+    valores, no con su cantidad.
+
+    Atributos:
+        relativeAccuracy (float): Error relativo máximo de los cuantiles.
+        gamma (float): Razón entre los límites de cubetas consecutivas.
+        count (int): Valores observados por columna.
+        zeros (ndarray): Ceros observados por columna.
+        counts (ndarray): Cuentas por columna y cubeta, desde la cubeta
+            offset.
+        offset (int): Índice de la primera cubeta de counts.
+    """
+
+    def __init__(self, nColumns, relativeAccuracy=0.01):
+        """
+        Args:
+            nColumns (int): Número de columnas.
+            relativeAccuracy (float): Opcional, error relativo máximo.
+        """
+        self.relativeAccuracy = relativeAccuracy
+        self.gamma = (1 + relativeAccuracy) / (1 - relativeAccuracy)
+        self.logGamma = math.log(self.gamma)
+        self.count = 0
+        self.zeros = np.zeros(nColumns, dtype=np.int64)
+        self.counts = np.zeros((nColumns, 0), dtype=np.int64)
+        self.offset = 0
+
+    def update(self, values):
+        """
+        Agrega varias filas de valores.
+
+        Args:
+            values (ndarray): Arreglo de forma (filas, columnas).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if (values < 0).any():
+            raise ValueError("El boceto de cuantiles solo admite valores no negativos")
+        nRows, nColumns = values.shape
+        self.count += nRows
+        positive = values > 0
+        self.zeros += nRows - positive.sum(axis=0)
+        columns = np.nonzero(positive)[1]
+        if len(columns) == 0:
+            return
+        keys = np.ceil(np.log(values[positive]) / self.logGamma).astype(np.int64)
+        self.extend(int(keys.min()), int(keys.max()))
+        nKeys = self.counts.shape[1]
+        self.counts += np.bincount((columns * nKeys) + keys - self.offset, minlength=nColumns * nKeys).reshape(nColumns, nKeys)
+
+    def extend(self, low, high):
+        """
+        Amplía counts para que incluya las cubetas de low a high.
+        """
+        nKeys = self.counts.shape[1]
+        if nKeys == 0:
+            self.offset = low
+            self.counts = np.zeros((len(self.zeros), high - low + 1), dtype=np.int64)
+            return
+        before = max(0, self.offset - low)
+        after = max(0, high - (self.offset + nKeys - 1))
+        if before or after:
+            self.counts = np.pad(self.counts, ((0, 0), (before, after)))
+            self.offset -= before
+
+    def getQuantiles(self, quantile):
+        """
+        Args:
+            quantile (float): Cuantil entre 0 y 1.
+
+        Returns:
+            ndarray: Valor aproximado del cuantil en cada columna, o NaN sin
+            valores.
+        """
+        if self.count == 0:
+            return np.full(len(self.zeros), np.nan)
+        rank = quantile * (self.count - 1)
+        result = np.zeros(len(self.zeros))
+        for column in range(0, len(self.zeros)):
+            if rank < self.zeros[column]:
+                continue
+            cumulative = self.zeros[column] + np.cumsum(self.counts[column])
+            key = self.offset + int(np.searchsorted(cumulative, rank, side="right"))
+            result[column] = 2 * (self.gamma ** key) / (self.gamma + 1)
+        return result
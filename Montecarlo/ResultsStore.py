@@ -0,0 +1,205 @@
+import json
+import os
+
+import numpy as np
+
+
+class ResultsStore:
+    """
+    Almacén columnar de resultados por juego, de solo agregado.
+
+    Cada columna se acumula en un arreglo de NumPy preasignado de chunkSize
+    filas; al llenarse se agrega al final de su archivo <columna>.bin dentro
+    del directorio path y meta.json se reescribe con el nuevo número de
+    filas. Las filas que no alcanzaron a registrarse en meta.json (por
+    ejemplo si el proceso se interrumpe a mitad de una escritura) se
+    descartan al reabrir el almacén. ResultsStore.load abre las columnas
+    con memoria mapeada, sin crear objetos de Python por juego.
+
+    Atributos:
+        path (str): Directorio del almacén.
+        chunkSize (int): Filas que se acumulan en memoria antes de escribir.
+        rows (int): Filas ya escritas en disco.
+        columns (dict): Tipo y forma por fila de cada columna.
+        version (int): Versión del formato; un almacén que se continúa
+            conserva la suya y sus columnas.
+        playerIndex (dict): Posición equipo * nPlayers + jugador de cada
+            identificador de jugador, como se guarda en las columnas
+            winnerPlayer, luckiestPlayer y playerWithMostXP.
+    """
+
+    version = 2
+
+    def __init__(self, path, nTeams=2, nPlayers=5, chunkSize=4096, append=False):
+        """
+        Crea un almacén vacío en path, o continúa uno existente.
+
+        Args:
+            path (str): Directorio del almacén.
+            nTeams (int): Número de equipos.
+            nPlayers (int): Jugadores por equipo.
+            chunkSize (int): Filas que se acumulan antes de escribir.
+            append (bool): Si es True y el almacén ya existe, las filas nuevas
+                se agregan a las existentes.
+        """
+        self.path = path
+        self.chunkSize = chunkSize
+        players = [nTeams, nPlayers]
+        self.columns = {"game": {"dtype": "<i8", "shape": []},
+                        "winnerTeam": {"dtype": "<i1", "shape": []},
+                        "roundsWonW": {"dtype": "<i2", "shape": []},
+                        "roundsWonM": {"dtype": "<i2", "shape": []},
+                        "winnerPlayer": {"dtype": "<i2", "shape": []},
+                        "luckiestPlayer": {"dtype": "<i2", "shape": []},
+                        "playerWithMostXP": {"dtype": "<i2", "shape": []},
+                        "finalScore": {"dtype": "<i8", "shape": players},
+                        "scoreByGame": {"dtype": "<i4", "shape": players},
+                        "roundsWon": {"dtype": "<i2", "shape": players},
+                        "luck": {"dtype": "<i2", "shape": players},
+                        "experience": {"dtype": "<i2", "shape": players}}
+        self.playerIndex = {id: i for i, id in enumerate(self.getPlayerIds(nTeams, nPlayers))}
+        self.rows = 0
+        os.makedirs(path, exist_ok=True)
+        if append and os.path.exists(self.getMetaPath()):
+            with open(self.getMetaPath()) as meta:
+                stored = json.load(meta)
+            self.columns = stored["columns"]
+            self.rows = stored["rows"]
+            self.version = stored.get("version", 1)
+        for name in self.columns:
+            # Descarta lo escrito después del último meta.json
+            with open(self.getColumnPath(name), "ab") as column:
+                column.truncate(self.rows * self.getRowSize(name))
+        self.buffer = {name: np.empty([chunkSize] + column["shape"], dtype=column["dtype"])
+                       for name, column in self.columns.items()}
+        self.buffered = 0
+        self.writeMeta()
+
+    @staticmethod
+    def getPlayerIds(nTeams, nPlayers):
+        """
+        Identificadores de los jugadores como los crea Team, en el orden de
+        playerIndex.
+
+        Returns:
+            list: Identificador de cada jugador, equipo por equipo.
+        """
+        return [str(p + 1) + chr(ord("A") + t) for t in range(nTeams) for p in range(nPlayers)]
+
+    def getMetaPath(self):
+        return os.path.join(self.path, "meta.json")
+
+    def getColumnPath(self, name):
+        return os.path.join(self.path, name + ".bin")
+
+    def getRowSize(self, name):
+        column = self.columns[name]
+        return int(np.dtype(column["dtype"]).itemsize * np.prod(column["shape"], dtype=np.int64))
+
+    def append(self, record, finalScores, statsByPlayer):
+        """
+        Agrega la fila de un juego terminado.
+
+        Args:
+            record (GameRecord): Resumen del juego.
+            finalScores (tuple): Por equipo, el score final acumulado de cada
+                jugador después del juego.
+            statsByPlayer (list): Por equipo, (rondas ganadas, suerte final,
+                experiencia) de cada jugador, como en Game.statsByPlayer.
+        """
+        row = self.buffered
+        self.buffer["game"][row] = record.id
+        self.buffer["winnerTeam"][row] = ord(record.winnerTeam) - ord("A")
+        self.buffer["roundsWonW"][row] = record.roundsWonW
+        self.buffer["roundsWonM"][row] = record.roundsWonM
+        # Los almacenes de versiones anteriores no tienen estas columnas
+        for name in ("winnerPlayer", "luckiestPlayer", "playerWithMostXP"):
+            if name in self.buffer:
+                self.buffer[name][row] = self.playerIndex[getattr(record, name)]
+        self.buffer["finalScore"][row] = finalScores
+        self.buffer["scoreByGame"][row] = record.scoreByGame
+        stats = np.array(statsByPlayer)
+        self.buffer["roundsWon"][row] = stats[:, :, 0]
+        self.buffer["luck"][row] = stats[:, :, 1]
+        self.buffer["experience"][row] = stats[:, :, 2]
+        self.buffered += 1
+        if self.buffered == self.chunkSize:
+            self.flush()
+
+    def appendBatch(self, columns):
+        """
+        Agrega varias filas de una vez, con un arreglo por columna.
+
+        Args:
+            columns (dict): Arreglo con una fila por juego para cada columna
+                del almacén.
+        """
+        self.flush()
+        for name, column in self.columns.items():
+            values = np.ascontiguousarray(columns[name], dtype=column["dtype"])
+            with open(self.getColumnPath(name), "ab") as output:
+                output.write(values.tobytes())
+        self.rows += len(columns["game"])
+        self.writeMeta()
+
+    def truncate(self, rows):
+        """
+        Descarta las filas a partir de rows, incluidas las que estén en memoria.
+
+        Args:
+            rows (int): Filas que se conservan.
+        """
+        self.flush()
+        self.rows = min(rows, self.rows)
+        for name in self.columns:
+            with open(self.getColumnPath(name), "ab") as column:
+                column.truncate(self.rows * self.getRowSize(name))
+        self.writeMeta()
+
+    def flush(self):
+        """
+        Escribe en disco las filas acumuladas en memoria.
+        """
+        if self.buffered == 0:
+            return
+        for name, values in self.buffer.items():
+            with open(self.getColumnPath(name), "ab") as column:
+                column.write(values[0:self.buffered].tobytes())
+        self.rows += self.buffered
+        self.buffered = 0
+        self.writeMeta()
+
+    def writeMeta(self):
+        temporaryPath = self.getMetaPath() + ".tmp"
+        with open(temporaryPath, "w") as meta:
+            json.dump({"version": self.version, "rows": self.rows, "columns": self.columns}, meta, indent=2)
+        os.replace(temporaryPath, self.getMetaPath())
+
+    def close(self):
+        """
+        Escribe las filas pendientes.
+        """
+        self.flush()
+
+    @staticmethod
+    def load(path):
+        """
+        Abre un almacén para análisis, con las columnas en memoria mapeada.
+
+        Args:
+            path (str): Directorio del almacén.
+
+        Returns:
+            dict: Arreglo de solo lectura por columna, con una fila por juego.
+        """
+        with open(os.path.join(path, "meta.json")) as meta:
+            stored = json.load(meta)
+        rows = stored["rows"]
+        columns = {}
+        for name, column in stored["columns"].items():
+            shape = tuple([rows] + column["shape"])
+            if rows == 0:
+                columns[name] = np.empty(shape, dtype=column["dtype"])
+                continue
+            columns[name] = np.memmap(os.path.join(path, name + ".bin"), dtype=column["dtype"], mode="r", shape=shape)
+        return columns
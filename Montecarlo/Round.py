@@ -1,27 +1,42 @@
 import taller_sc as pse
+from ScoreTable import ScoreTable
+from SimulationConfig import SimulationConfig
 
 
 class Round:
     """
         Clase que representa una ronda de un juego entre equipos.
+
+        Las distribuciones de puntuación por género se compilan una sola vez
+        en womenTable y menTable, compartidas por todas las rondas; una
+        SimulationConfig puede reemplazarlas por otras, también compartidas.
+
+        Atributos:
+            teams (list): Equipos participantes en la ronda.
+            fastTurns (bool): Si es True, el turno de cada jugador se toma de
+                la distribución precalculada del total de sus tiros.
     """
 
-    def __init__(self, teams):
+    womenScore = dict(SimulationConfig().womenScore)
+    menScore = dict(SimulationConfig().menScore)
+    womenTable = ScoreTable.get(womenScore.items())
+    menTable = ScoreTable.get(menScore.items())
+
+    def __init__(self, teams, fastTurns=False, config=None):
         """
             Inicializa una nueva ronda con los equipos proporcionados.
 
             Args:
                 teams (list): Lista de equipos participantes en la ronda.
+                fastTurns (bool): Opcional, usa playFastTurn en lugar de
+                    simular tiro por tiro.
+                config (SimulationConfig): Opcional, tablas de puntuación.
         """
         self.teams = teams
-        self.womenScore = {0.3: 10,
-                           0.68: 9,
-                           0.95: 8,
-                           1: 0}
-        self.menScore = {0.2: 10,
-                         0.53: 9,
-                         0.93: 8,
-                         1: 0}
+        self.fastTurns = fastTurns
+        if config is not None:
+            self.womenTable = config.getWomenTable()
+            self.menTable = config.getMenTable()
 
     def simulateRound(self):
         """
@@ -37,7 +52,7 @@ class Round:
             luckiestOne = team.players[self.getMaxLuck(team.players)]
             luckiestOne.increaseLuck()
             luckiestOne, team = self.validateLuckiestShot(luckiestOne, team)
-            team.players[self.getIndex(luckiestOne)] = luckiestOne
+            team.players[luckiestOne.index] = luckiestOne
             team = self.playRound(team)
             max_score_player = max(team.players, key=lambda x: x.score)
             winnerPlayers.append(max_score_player)
@@ -117,28 +132,26 @@ class Round:
         Returns:
             int: Puntuación del tiro.
         """
-        
         shot = pse.numbersMonteCarlo.get()
         if gender == "W":
-            for prob, score in sorted(self.womenScore.items()):
-                if shot <= prob:
-                    return score
-        else:
-            for prob, score in sorted(self.menScore.items()):
-                if shot <= prob:
-                    return score
+            return self.womenTable.getScore(shot)
+        return self.menTable.getScore(shot)
 
-    def getIndex(self, luckiestOne):
+    @classmethod
+    def getScores(cls, shots, gender):
         """
-        Obtiene el índice del jugador en la lista de jugadores.
+        Obtiene la puntuación de varios tiros de un mismo género.
 
         Args:
-            luckiestOne (Player): Jugador cuyo índice se desea obtener.
+            shots (ndarray): Números uniformes de los tiros.
+            gender (str): Género del jugador ("W" para mujer, "M" para hombre).
 
         Returns:
-            int: Índice del jugador en la lista de jugadores.
+            ndarray: Puntuación de cada tiro.
         """
-        return int(luckiestOne.id[0]) - 1
+        if gender == "W":
+            return cls.womenTable.getScores(shots)
+        return cls.menTable.getScores(shots)
 
     def playRound(self, team):
         """
@@ -151,10 +164,13 @@ class Round:
             Team: Equipo actualizado después de la ronda.
         """
         for player in team.players:
-            score = self.getScore(player.gender)
-            while player.simulateShot(score):
-                team.increaseScore(score)
+            if self.fastTurns:
+                self.playFastTurn(player, team)
+            else:
                 score = self.getScore(player.gender)
+                while player.simulateShot(score):
+                    team.increaseScore(score)
+                    score = self.getScore(player.gender)
             result = 2
             if(pse.numbersMonteCarlo.get() < 0.5):
                 result = 1
@@ -163,14 +179,32 @@ class Round:
 
 
 
+    def playFastTurn(self, player, team):
+        """
+        Simula el turno de un jugador con un solo número aleatorio.
+
+        Cada tiro descuenta 5 de resistencia mientras no quede negativa, así
+        que el número de tiros lo fija la resistencia; el total se toma de
+        la distribución precalculada para ese número de tiros y género.
+        Sigue la misma distribución que el ciclo de playRound, pero consume
+        menos números del flujo.
+
+        Args:
+            player (Player): Jugador que tira.
+            team (Team): Equipo del jugador.
+        """
+        shots = player.resistance // 5 if player.resistance >= 0 else 0
+        table = self.womenTable if player.gender == "W" else self.menTable
+        score = table.getTurnScore(pse.numbersMonteCarlo.get(), shots)
+        player.resistance -= 5 * shots
+        player.increaseScore(score)
+        team.increaseScore(score)
+
     def setWinnerTeam(self):
         """
         Establece el equipo ganador de la ronda.
         """
-        aux = max(self.teams, key=lambda x: x.score)
-        for team in self.teams:
-            if team.letter == aux.letter:
-                team.increaseRoundsWon()
+        max(self.teams, key=lambda x: x.score).increaseRoundsWon()
 
 
     def checkScores(self, winnerPlayers):
@@ -195,13 +229,10 @@ class Round:
 
     def updateData(self, winnerPlayers):
         """
-        Actualiza los datos del equipo con los jugadores ganadores.
+        Actualiza los equipos con los jugadores ganadores, en su posición.
 
         Args:
             winnerPlayers (list): Lista de jugadores ganadores.
         """
-        for team in self.teams:
-            for i, player in enumerate(team.players):
-                for winner in winnerPlayers:
-                    if player.id == winner.id:
-                        team.players[i] = winner
\ No newline at end of file
+        for winner in winnerPlayers:
+            self.teams[winner.teamIndex].players[winner.index] = winner
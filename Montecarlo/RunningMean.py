@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+
+
+class RunningMean:
+    """
+    Media y varianza de una serie de valores, actualizadas uno a uno con el
+    método de Welford, sin guardar los valores.
+
+    Atributos:
+        count (int): Valores observados.
+        mean (float): Media de los valores.
+        m2 (float): Suma de los cuadrados de las desviaciones a la media.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value):
+        """
+        Agrega un valor.
+
+        Args:
+            value (float): Valor observado.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def updateBatch(self, values):
+        """
+        Agrega varios valores a la vez, combinando su media y varianza con
+        las acumuladas (fórmula de Chan).
+
+        Args:
+            values (ndarray): Valores observados.
+        """
+        count = len(values)
+        if count == 0:
+            return
+        mean = float(np.mean(values))
+        m2 = float(np.sum((values - mean) ** 2))
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + (delta ** 2) * self.count * count / total
+        self.count = total
+
+    def getVariance(self):
+        """
+        Returns:
+            float: Varianza muestral de los valores, 0 con menos de dos.
+        """
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def getHalfWidth(self, z):
+        """
+        Semiancho del intervalo de confianza de la media.
+
+        Args:
+            z (float): Cuantil de la normal para la confianza deseada.
+
+        Returns:
+            float: z por el error estándar de la media.
+        """
+        if self.count == 0:
+            return math.inf
+        return z * math.sqrt(self.getVariance() / self.count)
@@ -0,0 +1,120 @@
+import bisect
+
+import numpy as np
+
+
+class ScoreTable:
+    """
+    Distribución de la puntuación de un tiro, compilada una sola vez.
+
+    Las probabilidades acumuladas quedan ordenadas en una lista y en un
+    arreglo; un tiro recibe la puntuación de la primera probabilidad mayor
+    o igual a él (shot <= prob), igual que el recorrido de Round.getScore.
+
+    Atributos:
+        probabilities (list): Probabilidades acumuladas en orden creciente.
+        scores (list): Puntuación correspondiente a cada probabilidad.
+    """
+
+    # Tablas ya compiladas, por sus pares (probabilidad, puntuación)
+    compiled = {}
+
+    def __init__(self, scoreByProbability):
+        """
+        Compila la tabla a partir de un diccionario probabilidad -> puntuación.
+
+        Args:
+            scoreByProbability (dict): Probabilidad acumulada y su puntuación.
+        """
+        items = sorted(scoreByProbability.items())
+        self.probabilities = [prob for prob, score in items]
+        self.scores = [score for prob, score in items]
+        self.probabilityArray = np.array(self.probabilities)
+        self.scoreArray = np.array(self.scores)
+        self.turnTables = {}
+
+    @classmethod
+    def get(cls, items):
+        """
+        Devuelve la tabla compilada para los pares dados, compilándola solo
+        la primera vez.
+
+        Args:
+            items (tuple): Pares (probabilidad acumulada, puntuación).
+
+        Returns:
+            ScoreTable: Tabla compartida.
+        """
+        items = tuple(sorted(items))
+        if items not in cls.compiled:
+            cls.compiled[items] = cls(dict(items))
+        return cls.compiled[items]
+
+    def getScore(self, shot):
+        """
+        Obtiene la puntuación de un tiro.
+
+        Args:
+            shot (float): Número uniforme del tiro.
+
+        Returns:
+            int: Puntuación del tiro.
+        """
+        return self.scores[bisect.bisect_left(self.probabilities, shot)]
+
+    def getTurnTable(self, shots):
+        """
+        Distribución del total de un turno de shots tiros, calculada la
+        primera vez que se pide y guardada para las siguientes.
+
+        Args:
+            shots (int): Número de tiros del turno.
+
+        Returns:
+            tuple: Totales posibles en orden creciente y su probabilidad
+            acumulada.
+        """
+        if shots not in self.turnTables:
+            shotProbabilities = {}
+            previous = 0
+            for prob, score in zip(self.probabilities, self.scores):
+                shotProbabilities[score] = shotProbabilities.get(score, 0) + prob - previous
+                previous = prob
+            totals = {0: 1.0}
+            for i in range(0, shots):
+                nextTotals = {}
+                for total, totalProb in totals.items():
+                    for score, prob in shotProbabilities.items():
+                        nextTotals[total + score] = nextTotals.get(total + score, 0) + totalProb * prob
+                totals = nextTotals
+            items = sorted(totals.items())
+            cumulative = list(np.cumsum([prob for total, prob in items]))
+            cumulative[-1] = 1.0
+            self.turnTables[shots] = ([total for total, prob in items], cumulative)
+        return self.turnTables[shots]
+
+    def getTurnScore(self, shot, shots):
+        """
+        Obtiene con un solo número el total de un turno de shots tiros.
+
+        Args:
+            shot (float): Número uniforme del turno.
+            shots (int): Número de tiros del turno.
+
+        Returns:
+            int: Suma de las puntuaciones de los tiros.
+        """
+        totals, cumulative = self.getTurnTable(shots)
+        return totals[bisect.bisect_left(cumulative, shot)]
+
+    def getScores(self, shots):
+        """
+        Obtiene la puntuación de varios tiros a la vez.
+
+        Args:
+            shots (ndarray): Números uniformes de los tiros.
+
+        Returns:
+            ndarray: Puntuación de cada tiro, con la misma forma.
+        """
+        return self.scoreArray[np.searchsorted(self.probabilityArray, shots, side="left")]
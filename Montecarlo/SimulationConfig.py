@@ -0,0 +1,89 @@
+import json
+import hashlib
+from typing import NamedTuple
+
+from ScoreTable import ScoreTable
+
+
+class SimulationConfig(NamedTuple):
+    """
+    Parámetros de una simulación. Los valores por defecto son los del juego
+    original.
+
+    Atributos:
+        teamSize (int): Jugadores por equipo.
+        rounds (int): Rondas por juego.
+        games (int): Juegos por simulación.
+        minResistance (int): Resistencia inicial mínima de los jugadores.
+        maxResistance (int): Límite superior de la resistencia inicial.
+        experience (int): Experiencia inicial de los jugadores.
+        womenScore (tuple): Pares (probabilidad acumulada, puntuación) de un
+            tiro de una mujer, en orden creciente.
+        menScore (tuple): Lo mismo para un hombre.
+    """
+    teamSize: int = 5
+    rounds: int = 10
+    games: int = 20000
+    minResistance: int = 25
+    maxResistance: int = 45
+    experience: int = 10
+    womenScore: tuple = ((0.3, 10), (0.68, 9), (0.95, 8), (1, 0))
+    menScore: tuple = ((0.2, 10), (0.53, 9), (0.93, 8), (1, 0))
+
+    @classmethod
+    def fromDict(cls, values):
+        """
+        Crea una configuración a partir de un diccionario, por ejemplo leído
+        de un JSON. Las tablas de puntuación pueden venir como diccionario
+        probabilidad -> puntuación o como lista de pares.
+
+        Args:
+            values (dict): Parámetros a cambiar respecto a los por defecto.
+
+        Returns:
+            SimulationConfig: La configuración.
+        """
+        unknown = set(values) - set(cls._fields)
+        if unknown:
+            raise ValueError("Parámetros desconocidos: " + ", ".join(sorted(unknown)))
+        values = dict(values)
+        for name in ("womenScore", "menScore"):
+            if name in values:
+                values[name] = cls.getScoreItems(values[name])
+        return cls(**values)
+
+    @staticmethod
+    def getScoreItems(scores):
+        items = scores.items() if isinstance(scores, dict) else scores
+        return tuple(sorted((float(prob), int(score)) for prob, score in items))
+
+    def toDict(self):
+        """
+        Returns:
+            dict: Los parámetros, con las tablas como listas de pares.
+        """
+        values = self._asdict()
+        for name in ("womenScore", "menScore"):
+            values[name] = [[float(prob), score] for prob, score in values[name]]
+        return values
+
+    def getHash(self, *extra):
+        """
+        Identificador estable de la configuración, para usarlo como llave de
+        caché.
+
+        Args:
+            *extra: Opcional, otros valores serializables a JSON que también
+                deben distinguir la llave.
+
+        Returns:
+            str: Resumen sha256 en hexadecimal.
+        """
+        text = json.dumps([self.toDict()] + list(extra), sort_keys=True)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def getWomenTable(self):
+        return ScoreTable.get(self.womenScore)
+
+    def getMenTable(self):
+        return ScoreTable.get(self.menScore)
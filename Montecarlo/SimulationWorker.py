@@ -0,0 +1,81 @@
+import queue
+import threading
+
+
+class SimulationWorker:
+    """
+    Ejecuta una simulación en un hilo aparte y publica su avance en una
+    cola, para que la interfaz la consulte con after() sin bloquearse.
+
+    Los mensajes de la cola son ("progress", Montecarlo.getProgress()),
+    ("done", lo que devuelva finish) o ("error", la excepción).
+
+    Atributos:
+        monteCarlo (Montecarlo): Simulador; su progress se reemplaza para
+            publicar en la cola.
+        run (callable): Recibe el simulador e inicia la simulación.
+        finish (callable): Opcional, recibe el simulador al terminar y
+            devuelve el resultado del mensaje "done"; se ejecuta en el hilo.
+        cancellable (bool): Si la simulación revisa los pedidos de
+            cancelación; en modo paralelo no lo hace.
+        queue (queue.Queue): Mensajes pendientes.
+        thread (threading.Thread): Hilo de la simulación.
+    """
+
+    def __init__(self, monteCarlo, run, finish=None, cancellable=True):
+        """
+        Args:
+            monteCarlo (Montecarlo): Simulador.
+            run (callable): Recibe el simulador e inicia la simulación.
+            finish (callable): Opcional, prepara el resultado final.
+            cancellable (bool): Opcional, False si la simulación no se puede
+                cancelar.
+        """
+        self.monteCarlo = monteCarlo
+        self.run = run
+        self.finish = finish
+        self.cancellable = cancellable
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.work, daemon=True)
+        monteCarlo.progress = self.publishProgress
+
+    def start(self):
+        """
+        Inicia el hilo; un pedido de cancelación anterior se descarta, pero
+        los que lleguen desde aquí se respetan aunque la simulación todavía
+        esté cargando un punto de control.
+        """
+        self.monteCarlo.cancelled = False
+        self.thread.start()
+
+    def cancel(self):
+        """
+        Pide al simulador terminar después del juego o lote actual.
+        """
+        self.monteCarlo.cancel()
+
+    def publishProgress(self, progress):
+        self.queue.put(("progress", progress))
+
+    def work(self):
+        try:
+            self.run(self.monteCarlo)
+            result = self.finish(self.monteCarlo) if self.finish is not None else None
+        except Exception as error:
+            self.queue.put(("error", error))
+            return
+        self.queue.put(("done", result))
+
+    def getMessages(self):
+        """
+        Saca sin esperar todos los mensajes pendientes.
+
+        Returns:
+            list: Mensajes en el orden en que se publicaron.
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self.queue.get_nowait())
+            except queue.Empty:
+                return messages
@@ -0,0 +1,131 @@
+import copy
+
+import numpy as np
+
+from QuantileSketch import QuantileSketch
+
+
+class StreamingStats:
+    """
+    Estadísticas de varias variables que se actualizan por lotes sin guardar
+    los valores: cantidad, media y varianza (fórmula de Chan), mínimo,
+    máximo, un histograma de cubetas fijas y un QuantileSketch.
+
+    Atributos:
+        names (list): Nombre de cada variable.
+        low (float): Inicio del histograma.
+        high (float): Fin del histograma.
+        count (int): Valores observados por variable.
+        mean (ndarray): Media de cada variable.
+        m2 (ndarray): Suma de los cuadrados de las desviaciones a la media.
+        minimum (ndarray): Mínimo de cada variable.
+        maximum (ndarray): Máximo de cada variable.
+        histogram (ndarray): Cuentas por variable y cubeta.
+        underflow (ndarray): Valores menores que low.
+        overflow (ndarray): Valores mayores o iguales que high.
+        sketch (QuantileSketch): Cuantiles aproximados.
+    """
+
+    def __init__(self, names, low, high, nBins, relativeAccuracy=0.01):
+        """
+        Args:
+            names (list): Nombre de cada variable.
+            low (float): Inicio del histograma.
+            high (float): Fin del histograma.
+            nBins (int): Cubetas del histograma, de igual ancho.
+            relativeAccuracy (float): Opcional, error relativo de los
+                cuantiles.
+        """
+        nColumns = len(names)
+        self.names = list(names)
+        self.low = low
+        self.high = high
+        self.count = 0
+        self.mean = np.zeros(nColumns)
+        self.m2 = np.zeros(nColumns)
+        self.minimum = np.full(nColumns, np.inf)
+        self.maximum = np.full(nColumns, -np.inf)
+        self.histogram = np.zeros((nColumns, nBins), dtype=np.int64)
+        self.underflow = np.zeros(nColumns, dtype=np.int64)
+        self.overflow = np.zeros(nColumns, dtype=np.int64)
+        self.sketch = QuantileSketch(nColumns, relativeAccuracy)
+
+    def update(self, values):
+        """
+        Agrega varias filas de valores.
+
+        Args:
+            values (ndarray): Arreglo de forma (filas, variables).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        count = len(values)
+        if count == 0:
+            return
+        mean = values.mean(axis=0)
+        m2 = ((values - mean) ** 2).sum(axis=0)
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + (delta ** 2) * self.count * count / total
+        self.count = total
+        self.minimum = np.minimum(self.minimum, values.min(axis=0))
+        self.maximum = np.maximum(self.maximum, values.max(axis=0))
+
+        nColumns, nBins = self.histogram.shape
+        bins = np.floor((values - self.low) * nBins / (self.high - self.low)).astype(np.int64)
+        self.underflow += (bins < 0).sum(axis=0)
+        self.overflow += (bins >= nBins).sum(axis=0)
+        inside = (bins >= 0) & (bins < nBins)
+        columns = np.nonzero(inside)[1]
+        self.histogram += np.bincount((columns * nBins) + bins[inside], minlength=nColumns * nBins).reshape(nColumns, nBins)
+        self.sketch.update(values)
+
+    def getMerged(self, values):
+        """
+        Args:
+            values (ndarray): Arreglo de forma (filas, variables).
+
+        Returns:
+            StreamingStats: Una copia con las filas agregadas; esta no
+            cambia.
+        """
+        merged = copy.deepcopy(self)
+        merged.update(values)
+        return merged
+
+    def getVariance(self):
+        """
+        Returns:
+            ndarray: Varianza muestral de cada variable, 0 con menos de dos
+            valores.
+        """
+        if self.count < 2:
+            return np.zeros(len(self.names))
+        return self.m2 / (self.count - 1)
+
+    def getReport(self, quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)):
+        """
+        Args:
+            quantiles (tuple): Opcional, cuantiles a estimar.
+
+        Returns:
+            dict: Por variable, cantidad, media, varianza, mínimo, máximo,
+            cuantiles e histograma (con sus límites y los valores fuera de
+            ellos).
+        """
+        variance = self.getVariance()
+        estimates = {str(quantile): self.sketch.getQuantiles(quantile) for quantile in quantiles}
+        report = {}
+        for i, name in enumerate(self.names):
+            report[name] = {"count": self.count,
+                            "mean": float(self.mean[i]),
+                            "variance": float(variance[i]),
+                            "min": float(self.minimum[i]) if self.count else None,
+                            "max": float(self.maximum[i]) if self.count else None,
+                            "quantiles": {quantile: float(values[i]) for quantile, values in estimates.items()},
+                            "histogram": {"low": self.low,
+                                          "high": self.high,
+                                          "counts": self.histogram[i].tolist(),
+                                          "underflow": int(self.underflow[i]),
+                                          "overflow": int(self.overflow[i])}}
+        return report
@@ -0,0 +1,221 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import taller_sc as pse
+from Montecarlo import Montecarlo
+from SimulationConfig import SimulationConfig
+
+# Resultados de cada punto ya simulado, un JSON por punto
+sweepCacheDir = os.path.join(pse.streamCacheDir, "sweeps")
+
+# Módulos que determinan los resultados de una simulación
+simulationModules = ["taller_sc", "Player", "Team", "Round", "Game", "ScoreTable", "GameRecord", "VectorEngine",
+                     "SimulationConfig", "Montecarlo"]
+
+
+def getCodeVersion():
+    """
+    Resumen del código de los módulos de la simulación; cualquier cambio en
+    ellos invalida los resultados guardados.
+
+    Returns:
+        str: Resumen sha256 en hexadecimal.
+    """
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in simulationModules:
+        with open(os.path.join(directory, name + ".py"), "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def expandGrid(base, grid):
+    """
+    Combina todos los valores de la grilla sobre una configuración base.
+
+    Args:
+        base (SimulationConfig): Valores de los parámetros que no varían.
+        grid (dict): Parámetro -> lista de valores.
+
+    Returns:
+        list: Una SimulationConfig por combinación, variando más rápido el
+        último parámetro.
+    """
+    names = list(grid)
+    configs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        configs.append(SimulationConfig.fromDict(dict(base.toDict(), **dict(zip(names, values)))))
+    return configs
+
+
+def getKeyOptions(options):
+    """
+    Opciones de simulación que cambian el resultado de un punto: la semilla
+    solo la usa el motor vectorial y los turnos rápidos solo el de objetos.
+
+    Args:
+        options (dict): "engine", "seed" y "fastTurns" de la simulación.
+
+    Returns:
+        dict: Las opciones que forman parte de la llave del punto.
+    """
+    if options["engine"] == "vector":
+        return {"engine": "vector", "seed": options["seed"]}
+    return {"engine": options["engine"], "fastTurns": options["fastTurns"]}
+
+
+def isCacheable(options):
+    """
+    Sin semilla el motor vectorial no es reproducible, así que sus puntos no
+    se leen ni se guardan.
+    """
+    return options["engine"] != "vector" or options["seed"] is not None
+
+
+def getPointPath(config, options, codeVersion, cacheDir=None):
+    return os.path.join(cacheDir or sweepCacheDir, config.getHash(getKeyOptions(options), codeVersion) + ".json")
+
+
+def simulatePoint(config, options):
+    """
+    Simula un punto del barrido sin gráficas, en un proceso del barrido.
+
+    El flujo global de números aleatorios se reinicia en cada punto, de modo
+    que el resultado solo depende de la configuración y las opciones.
+
+    Args:
+        config (SimulationConfig): Configuración del punto.
+        options (dict): "engine", "seed" y "fastTurns" de la simulación.
+
+    Returns:
+        dict: Resumen de Montecarlo.getSummary, con el score medio por juego
+        de cada jugador y los segundos que tomó.
+    """
+    pse.numbersMonteCarlo = pse.generateNumbersForMonteCarlo()
+    monteCarlo = Montecarlo(fastTurns=options["fastTurns"], config=config)
+    start = time.perf_counter()
+    monteCarlo.startSimulation(config.games, 1, options["engine"], options["seed"])
+    summary = monteCarlo.getSummary()
+    summary["meanScoreByGame"] = {id: score / summary["games"] for id, score in summary["finalScore"].items()}
+    summary["elapsedSeconds"] = time.perf_counter() - start
+    return summary
+
+
+def savePoint(path, config, options, codeVersion, result):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporaryPath = path + ".tmp"
+    with open(temporaryPath, "w") as point:
+        json.dump({"config": config.toDict(), "options": options, "codeVersion": codeVersion, "result": result}, point)
+    os.replace(temporaryPath, path)
+
+
+def runSweep(configs, workers=1, engine="objects", seed=None, fastTurns=False, cacheDir=None, useCache=True):
+    """
+    Simula los puntos de un barrido que no estén ya guardados, repartidos en
+    un grupo de procesos, y guarda el resultado de cada uno en cuanto
+    termina.
+
+    Cada punto se guarda bajo un resumen de su configuración, las opciones
+    de simulación que afectan su resultado y la versión del código, así que
+    al repetir un barrido que se solapa con otro solo se simulan los puntos
+    nuevos. Con el motor vectorial sin semilla no se usan los resultados
+    guardados ni se guardan los nuevos.
+
+    Args:
+        configs (list): Configuraciones de los puntos.
+        workers (int): Número de procesos.
+        engine (str): Motor de simulación, "objects" o "vector".
+        seed (int): Opcional, semilla del motor vectorial.
+        fastTurns (bool): Opcional, los juegos usan Round.playFastTurn.
+        cacheDir (str): Opcional, directorio de los resultados guardados.
+        useCache (bool): Si es False se simulan todos los puntos y se
+            reemplazan los guardados.
+
+    Returns:
+        list: Por punto, en el orden de configs, un diccionario con su
+        configuración, su resultado y si venía guardado ("cached").
+    """
+    options = {"engine": engine, "seed": seed, "fastTurns": fastTurns}
+    cacheable = isCacheable(options)
+    codeVersion = getCodeVersion()
+    points = [{"config": config.toDict(), "cached": False, "result": None} for config in configs]
+    pending = {}
+    for i, config in enumerate(configs):
+        path = getPointPath(config, options, codeVersion, cacheDir)
+        if useCache and cacheable and os.path.exists(path):
+            with open(path) as point:
+                points[i]["result"] = json.load(point)["result"]
+            points[i]["cached"] = True
+        else:
+            # Un punto repetido en el barrido se simula una sola vez
+            pending.setdefault(path, []).append(i)
+
+    def finish(path, result):
+        if cacheable:
+            savePoint(path, configs[pending[path][0]], getKeyOptions(options), codeVersion, result)
+        for i in pending[path]:
+            points[i]["result"] = result
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(simulatePoint, configs[indices[0]], options): path for path, indices in pending.items()}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+    else:
+        for path, indices in pending.items():
+            finish(path, simulatePoint(configs[indices[0]], options))
+    return points
+
+
+def main(argv=None):
+    """
+    Ejecuta el barrido descrito en un archivo JSON con las llaves "grid"
+    (parámetro -> lista de valores) y, opcionalmente, "base" (parámetros
+    fijos), e imprime una fila por punto.
+
+    Args:
+        argv (list): Opcional, argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Barrido de parámetros con resultados guardados por punto.")
+    parser.add_argument("sweep", help="archivo JSON con \"grid\" y, opcionalmente, \"base\"")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="número de procesos (por defecto uno por CPU)")
+    parser.add_argument("--engine", choices=["objects", "vector"], default="objects", help="motor de simulación")
+    parser.add_argument("--seed", type=int, help="semilla del generador del motor vectorial")
+    parser.add_argument("--fast-turns", action="store_true",
+                        help="toma el total de cada turno de una distribución precalculada")
+    parser.add_argument("--cache-dir", help=f"directorio de los resultados guardados (por defecto {sweepCacheDir})")
+    parser.add_argument("--no-cache", action="store_true", help="simula todos los puntos aunque estén guardados")
+    parser.add_argument("--output", help="archivo JSON donde se escriben los resultados del barrido")
+    arguments = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    with open(arguments.sweep) as sweepFile:
+        sweep = json.load(sweepFile)
+    if not sweep.get("grid"):
+        parser.error("el archivo debe tener una grilla \"grid\" no vacía")
+
+    configs = expandGrid(SimulationConfig.fromDict(sweep.get("base", {})), sweep["grid"])
+    if arguments.engine == "vector" and arguments.seed is None:
+        print("Sin --seed el motor vectorial no es reproducible: los puntos no se guardan")
+    start = time.perf_counter()
+    points = runSweep(configs, arguments.workers, arguments.engine, arguments.seed, arguments.fast_turns,
+                      arguments.cache_dir, not arguments.no_cache)
+    names = list(sweep["grid"])
+    print("".join(f"{name:>16}" for name in names) + f"{'juegos':>10}{'W':>10}{'M':>10}{'s':>10}  guardado")
+    for point in points:
+        result = point["result"]
+        values = "".join(f"{str(point['config'][name]):>16}" for name in names)
+        print(values + f"{result['games']:>10}{result['winsByGender']['W']:>10}{result['winsByGender']['M']:>10}"
+              + f"{result['elapsedSeconds']:>10.1f}  {'sí' if point['cached'] else 'no'}")
+    computed = sum(1 for point in points if not point["cached"])
+    print(f"{len(points)} puntos, {computed} simulados en {time.perf_counter() - start:.1f} s")
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump({"grid": sweep["grid"], "points": points}, output, indent=2)
+
+if __name__ == "__main__":
+    main()
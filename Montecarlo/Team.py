@@ -1,6 +1,7 @@
 import taller_sc as pse
 
 from Player import Player
+from SimulationConfig import SimulationConfig
 
 
 class Team:
@@ -14,20 +15,30 @@ class Team:
         roundsWon (int): Número de rondas ganadas por el equipo.
         finalGameWon (int): Número de juegos finales ganados por el equipo.
         scoreByRound (int): Puntuación acumulada en una ronda por el equipo.
+        index (int): Posición del equipo en la lista de equipos.
     """
 
-    def __init__(self, letter):
+    __slots__ = ("letter", "players", "score", "roundsWon", "finalGameWon", "scoreByRound", "index")
+
+    def __init__(self, letter, index, config=None):
         """
         Inicializa un objeto Team con la letra identificadora dada.
 
         Args:
             letter (str): Letra identificadora del equipo.
+            index (int): Posición del equipo en la lista de equipos; Round
+                la usa para devolver los jugadores a su equipo, así que debe
+                ser distinta en cada equipo.
+            config (SimulationConfig): Opcional, tamaño del equipo, rango de
+                resistencia y experiencia inicial.
         """
+        config = config or SimulationConfig()
         self.letter = letter
+        self.index = index
         self.players = []
-        for i in range(0, 5):
-            resistance = int(25 +((45 - 25) * pse.numbersMonteCarlo.get()))
-            self.players.append(Player(str(i + 1) + letter, resistance, 10, self.getGender()))
+        for i in range(0, config.teamSize):
+            resistance = int(config.minResistance + ((config.maxResistance - config.minResistance) * pse.numbersMonteCarlo.get()))
+            self.players.append(Player(str(i + 1) + letter, resistance, config.experience, self.getGender(), index, i))
         self.score = 0
         self.roundsWon = 0
         self.finalGameWon = 0
@@ -0,0 +1,77 @@
+import copy
+
+import numpy as np
+
+
+class Trajectory:
+    """
+    Trayectoria submuestreada de varias variables a lo largo de los juegos,
+    con a lo sumo maxPoints puntos.
+
+    Se guardan los juegos múltiplos de stride; cuando hay más de maxPoints
+    puntos se descarta uno de cada dos y stride se duplica, así que los
+    puntos quedan espaciados de forma uniforme sin importar cuántos juegos
+    se simulen.
+
+    Atributos:
+        maxPoints (int): Máximo de puntos guardados.
+        stride (int): Separación en juegos entre puntos guardados.
+        games (ndarray): Juego de cada punto.
+        values (ndarray): Valores de cada punto, una fila por punto.
+        last (tuple): Último juego agregado y sus valores.
+    """
+
+    def __init__(self, maxPoints=1000):
+        self.maxPoints = maxPoints
+        self.stride = 1
+        self.games = np.zeros(0, dtype=np.int64)
+        self.values = None
+        self.last = None
+
+    def add(self, games, values):
+        """
+        Agrega varios juegos consecutivos.
+
+        Args:
+            games (ndarray): Número de cada juego.
+            values (ndarray): Valores de cada juego, una fila por juego.
+        """
+        games = np.asarray(games)
+        values = np.asarray(values)
+        if len(games) == 0:
+            return
+        self.last = (int(games[-1]), values[-1].copy())
+        kept = games % self.stride == 0
+        self.games = np.concatenate([self.games, games[kept]])
+        self.values = values[kept].copy() if self.values is None else np.concatenate([self.values, values[kept]])
+        while len(self.games) > self.maxPoints:
+            self.stride *= 2
+            kept = self.games % self.stride == 0
+            self.games = self.games[kept]
+            self.values = self.values[kept]
+
+    def getMerged(self, games, values):
+        """
+        Args:
+            games (ndarray): Número de cada juego.
+            values (ndarray): Valores de cada juego, una fila por juego.
+
+        Returns:
+            Trajectory: Una copia con los juegos agregados; esta no cambia,
+            porque add reemplaza los arreglos en lugar de modificarlos.
+        """
+        merged = copy.copy(self)
+        merged.add(games, values)
+        return merged
+
+    def getPoints(self):
+        """
+        Returns:
+            tuple: Juegos y valores guardados, terminando siempre en el
+            último juego agregado.
+        """
+        if self.last is None:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, 0))
+        if len(self.games) and self.games[-1] == self.last[0]:
+            return self.games, self.values
+        return np.append(self.games, self.last[0]), np.vstack([self.values, self.last[1][None, :]])
@@ -0,0 +1,210 @@
+import sys
+import json
+import argparse
+
+import numpy as np
+from scipy.stats import norm
+
+import taller_sc as pse
+from Game import Game
+from GameRecord import GameRecord
+from SimulationConfig import SimulationConfig
+from Team import Team
+
+
+class GameStream:
+    """
+    Fuente de números aleatorios alineada por juego, que reemplaza a
+    pse.numbersMonteCarlo al comparar configuraciones.
+
+    La creación de los equipos (juego 0) y cada juego usan su propio
+    generador, derivado de (seed, juego). Si dos configuraciones consumen
+    distinta cantidad de números en un juego, en el siguiente vuelven a
+    recibir los mismos (números aleatorios comunes). Con antithetic cada
+    número u se entrega como 1 - u.
+
+    Atributos:
+        seed (int): Semilla común.
+        antithetic (bool): Si se entrega 1 - u en lugar de u.
+        consumed (int): Números entregados.
+    """
+
+    def __init__(self, seed, antithetic=False, bufferSize=1024):
+        """
+        Args:
+            seed (int): Semilla común.
+            antithetic (bool): Opcional, entrega 1 - u.
+            bufferSize (int): Números que se generan a la vez.
+        """
+        self.seed = seed
+        self.antithetic = antithetic
+        self.bufferSize = bufferSize
+        self.consumed = 0
+        self.startGame(0)
+
+    def startGame(self, game):
+        """
+        Pasa al generador del juego dado.
+
+        Args:
+            game (int): Número del juego; 0 para la creación de los equipos.
+        """
+        self.generator = np.random.default_rng([self.seed, game])
+        self._buffer = []
+        self._position = 0
+
+    def get(self):
+        if self._position >= len(self._buffer):
+            numbers = self.generator.random(self.bufferSize)
+            if self.antithetic:
+                numbers = 1 - numbers
+            self._buffer = numbers.tolist()
+            self._position = 0
+        number = self._buffer[self._position]
+        self._position += 1
+        self.consumed += 1
+        return number
+
+
+def getVariantConfig(variant):
+    """
+    Convierte una configuración del archivo de variantes en SimulationConfig.
+
+    Args:
+        variant (dict): Parámetros de SimulationConfig a cambiar, por ejemplo
+            "womenScore" y "menScore" (probabilidad acumulada -> puntuación);
+            "resistance" ([mínima, máxima]) es un atajo de minResistance y
+            maxResistance, y "name" se ignora.
+
+    Returns:
+        SimulationConfig: La configuración.
+    """
+    values = {name: value for name, value in variant.items() if name not in ("name", "resistance")}
+    if "resistance" in variant:
+        values["minResistance"], values["maxResistance"] = variant["resistance"]
+    return SimulationConfig.fromDict(values)
+
+
+def simulateVariant(variant, nGames, seed, antithetic=False):
+    """
+    Simula nGames juegos de una configuración con un GameStream.
+
+    Args:
+        variant (dict): Configuración, como en getVariantConfig.
+        nGames (int): Número de juegos.
+        seed (int): Semilla común.
+        antithetic (bool): Opcional, usa 1 - u.
+
+    Returns:
+        tuple: Nombres de las métricas y arreglo con una fila de métricas por
+        juego: victoria de mujeres, de hombres, de cada equipo, score de cada
+        jugador en el juego y score total del juego.
+    """
+    config = getVariantConfig(variant)
+    previousStream = pse.numbersMonteCarlo
+    pse.numbersMonteCarlo = GameStream(seed, antithetic)
+    try:
+        teams = [Team("A", 0, config), Team("B", 1, config)]
+        letters = [team.letter for team in teams]
+        names = ["W", "M"] + letters + [player.id for team in teams for player in team.players] + ["totalScore"]
+        metrics = np.empty((nGames, len(names)))
+        for i in range(0, nGames):
+            pse.numbersMonteCarlo.startGame(i + 1)
+            game = Game(teams, i + 1, config=config)
+            game.simulateGame()
+            teams = game.teams
+            record = GameRecord.fromGame(game)
+            scores = [score for teamScores in record.scoreByGame for score in teamScores]
+            metrics[i] = ([record.roundsWonW > record.roundsWonM, record.roundsWonM > record.roundsWonW]
+                          + [record.winnerTeam == letter for letter in letters] + scores + [sum(scores)])
+    finally:
+        pse.numbersMonteCarlo = previousStream
+    return names, metrics
+
+
+def compareVariants(variants, nGames, seed=0, antithetic=False, confidence=0.95):
+    """
+    Estima la diferencia entre dos configuraciones (o la media de una sola)
+    con números aleatorios comunes y, opcionalmente, variables antitéticas.
+
+    Todas las corridas usan la misma semilla, así que el juego i de cada
+    configuración recibe los mismos números; con antithetic cada
+    configuración se corre también con 1 - u y se promedian las dos. La
+    estimación por juego es la diferencia de esos promedios y su varianza se
+    compara con la que tendría la misma estimación con corridas
+    independientes (la suma de las varianzas de cada corrida, ponderadas).
+
+    Args:
+        variants (list): Una o dos configuraciones, como en getVariantConfig.
+        nGames (int): Juegos por corrida.
+        seed (int): Semilla común.
+        antithetic (bool): Opcional, agrega las corridas con 1 - u.
+        confidence (float): Nivel de confianza de los intervalos.
+
+    Returns:
+        dict: Por métrica, la media de cada configuración, la estimación,
+        el semiancho de su intervalo, su varianza por juego, la varianza
+        con corridas independientes y el factor de reducción.
+    """
+    passes = [False, True] if antithetic else [False]
+    runs = []
+    for v, variant in enumerate(variants):
+        sign = 1 if v == 0 else -1
+        for antitheticPass in passes:
+            names, metrics = simulateVariant(variant, nGames, seed, antitheticPass)
+            runs.append((v, sign / len(passes), metrics))
+
+    z = float(norm.ppf(0.5 + (confidence / 2)))
+    estimate = sum(weight * metrics for v, weight, metrics in runs)
+    variance = estimate.var(axis=0, ddof=1)
+    independentVariance = sum((weight ** 2) * metrics.var(axis=0, ddof=1) for v, weight, metrics in runs)
+    report = {}
+    for i, name in enumerate(names):
+        means = [float(np.mean([metrics[:, i].mean() for run, weight, metrics in runs if run == v]))
+                 for v in range(0, len(variants))]
+        report[name] = {"means": means,
+                        "estimate": float(estimate[:, i].mean()),
+                        "halfWidth": z * float(np.sqrt(variance[i] / nGames)),
+                        "variance": float(variance[i]),
+                        "independentVariance": float(independentVariance[i]),
+                        "varianceReduction": float(independentVariance[i] / variance[i]) if variance[i] > 0 else None}
+    return {"games": nGames,
+            "seed": seed,
+            "antithetic": antithetic,
+            "confidence": confidence,
+            "variants": variants,
+            "metrics": report}
+
+
+def main(argv=None):
+    """
+    Compara las configuraciones de un archivo JSON e imprime la estimación
+    y la reducción de varianza de cada métrica.
+
+    Args:
+        argv (list): Opcional, argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Compara configuraciones con números aleatorios comunes.")
+    parser.add_argument("variants", help="archivo JSON con una o dos configuraciones")
+    parser.add_argument("--games", type=int, default=2000, help="juegos por corrida (por defecto 2000)")
+    parser.add_argument("--seed", type=int, default=0, help="semilla común")
+    parser.add_argument("--antithetic", action="store_true", help="agrega corridas con 1 - u")
+    parser.add_argument("--confidence", type=float, default=0.95, help="nivel de confianza de los intervalos")
+    parser.add_argument("--output", help="archivo JSON donde se escribe el informe")
+    arguments = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    with open(arguments.variants) as variantsFile:
+        variants = json.load(variantsFile)
+    if len(variants) not in (1, 2):
+        parser.error("el archivo debe tener una o dos configuraciones")
+
+    report = compareVariants(variants, arguments.games, arguments.seed, arguments.antithetic, arguments.confidence)
+    print(f"{'métrica':<12}{'estimación':>14}{'±':>10}{'reducción':>12}")
+    for name, metric in report["metrics"].items():
+        reduction = "-" if metric["varianceReduction"] is None else f"{metric['varianceReduction']:.2f}x"
+        print(f"{name:<12}{metric['estimate']:>14.4f}{metric['halfWidth']:>10.4f}{reduction:>12}")
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import numpy as np
+
+from SimulationConfig import SimulationConfig
+
+
+class VectorEngine:
+    """
+    Motor alternativo que simula muchos juegos a la vez con arreglos de NumPy.
+
+    Aplica las mismas reglas que Game, Round y Player, pero el estado de los
+    jugadores (resistencia, suerte, tiros consecutivos, experiencia, bono,
+    puntajes) se guarda en arreglos de forma (juegos, equipos, jugadores) y
+    cada ronda avanza todos los juegos del lote con operaciones de arreglos.
+    Los juegos solo dependen entre sí por el score acumulado de los equipos,
+    que decide quién gana cada ronda; esa parte se resuelve al final del lote
+    con una suma acumulada en el orden de los juegos.
+
+    Los números aleatorios salen de random(shape), por defecto un
+    np.random.Generator; se consumen en otro orden que en el motor de
+    objetos, así que los resultados coinciden en distribución, no juego a
+    juego.
+
+    Atributos:
+        teams (list): Equipos simulados; sus contadores acumulados se
+            actualizan al terminar cada lote.
+        random (callable): Devuelve un arreglo de uniformes con la forma dada.
+        generator (np.random.Generator): Generador por defecto, o None si
+            se dio random.
+        config (SimulationConfig): Rondas por juego y tablas de puntuación.
+        probabilities (ndarray): Probabilidades acumuladas de las tablas de
+            mujeres y hombres, de igual largo.
+        scores (ndarray): Puntuación de cada probabilidad.
+    """
+
+    def __init__(self, teams, random=None, seed=None, config=None):
+        """
+        Prepara el motor para los equipos dados.
+
+        Args:
+            teams (list): Equipos del simulador.
+            random (callable): Opcional, fuente de uniformes random(shape).
+            seed (int): Opcional, semilla del generador por defecto.
+            config (SimulationConfig): Opcional, rondas y tablas de puntuación.
+        """
+        self.teams = teams
+        self.config = config or SimulationConfig()
+        women = list(self.config.womenScore)
+        men = list(self.config.menScore)
+        # Repetir la primera entrada de la tabla más corta no cambia sus
+        # puntuaciones y permite recorrer ambas a la vez en getScores
+        length = max(len(women), len(men))
+        women = [women[0]] * (length - len(women)) + women
+        men = [men[0]] * (length - len(men)) + men
+        self.probabilities = np.array([[prob for prob, score in women], [prob for prob, score in men]])
+        self.scores = np.array([[score for prob, score in women], [score for prob, score in men]])
+        self.generator = np.random.default_rng(seed) if random is None else None
+        self.random = random if random is not None else self.generator.random
+        self.isWoman = np.array([[player.gender == "W" for player in team.players] for team in teams])
+        self.initialResistance = np.array([[player.initialResistance for player in team.players] for team in teams])
+        self.initialExperience = np.array([[player.initialExperience for player in team.players] for team in teams])
+        self.playerIds = [[player.id for player in team.players] for team in teams]
+
+    def getScores(self, shots, isWoman):
+        """
+        Versión por arreglos de Round.getScore para tiros de ambos géneros.
+
+        Recorre las tablas de la configuración de la última probabilidad a
+        la primera, de modo que cada tiro se queda
+        con la primera probabilidad acumulada mayor o igual a él; con pocas
+        probabilidades es más rápido que un searchsorted por género.
+
+        Args:
+            shots (ndarray): Uniformes de los tiros.
+            isWoman (ndarray): Género de quien tira, con forma compatible.
+
+        Returns:
+            ndarray: Puntuación de cada tiro.
+        """
+        women, men = self.probabilities
+        womenScores, menScores = self.scores
+        scores = np.where(isWoman, womenScores[-1], menScores[-1])
+        for i in range(len(women) - 2, -1, -1):
+            probability = np.where(isWoman, women[i], men[i])
+            scores = np.where(shots <= probability, np.where(isWoman, womenScores[i], menScores[i]), scores)
+        return scores
+
+    def simulateBatch(self, nGames):
+        """
+        Simula nGames juegos seguidos y actualiza los equipos.
+
+        Args:
+            nGames (int): Número de juegos del lote.
+
+        Returns:
+            dict: Arreglos con una fila por juego: winnerTeam (índice del
+            equipo), roundsWonW, roundsWonM, winnerPlayer, luckiestPlayer y
+            playerWithMostXP (índices (equipo, jugador)), scoreByGame,
+            finalScore acumulado, roundsWon, luck y experience por jugador.
+        """
+        nTeams, nPlayers = self.isWoman.shape
+        shape = (nGames, nTeams, nPlayers)
+        games = np.arange(nGames)[:, None]
+        teams = np.arange(nTeams)[None, :]
+
+        resistance = np.broadcast_to(self.initialResistance, shape).copy()
+        roundResistance = resistance.copy()
+        experience = np.broadcast_to(self.initialExperience, shape).copy()
+        consecutiveShot = np.zeros(shape, dtype=np.int64)
+        bufferExperience = np.zeros(shape, dtype=np.int64)
+        remainingRoundsOfBonus = np.zeros(shape, dtype=np.int64)
+        wonRound = np.zeros(shape, dtype=np.int64)
+        finalLuck = np.zeros(shape, dtype=np.int64)
+        scoreByGame = np.zeros(shape, dtype=np.int64)
+        rounds = self.config.rounds
+        teamScoreByRound = np.zeros((nGames, rounds, nTeams), dtype=np.int64)
+        womanWonRound = np.zeros((nGames, rounds), dtype=bool)
+
+        for r in range(0, rounds):
+            # Round.updateLuckAndBonus
+            remainingRoundsOfBonus = np.maximum(remainingRoundsOfBonus - 1, 0)
+            luck = 1 + ((3 - 1) * self.random(shape))
+
+            # Round.validateLuckiestShot sobre el primer jugador con más suerte
+            luckiest = luck.argmax(axis=2)
+            finalLuck[games, teams, luckiest] += 1
+            shot = consecutiveShot[games, teams, luckiest]
+            consecutiveShot[shot == 0] = 0
+            shot = shot + 1
+            thirdShot = shot == 3
+            shot[thirdShot] = 0
+            consecutiveShot[games, teams, luckiest] = shot
+            auxScore = self.getScores(self.random((nGames, nTeams)), self.isWoman[teams, luckiest])
+            # simulateShot(score, False) descuenta la resistencia dos veces y
+            # solo cuenta el tiro si ambas alcanzan
+            luckiestResistance = resistance[games, teams, luckiest]
+            doubleShot = ~thirdShot & (luckiestResistance >= 10)
+            singleShot = ~thirdShot & (luckiestResistance >= 5) & (luckiestResistance < 10)
+            resistance[games, teams, luckiest] = luckiestResistance - (10 * doubleShot) - (5 * singleShot)
+            teamScoreByRound[:, r] += np.where(thirdShot | doubleShot, auxScore, 0)
+
+            # Round.playRound: cada jugador tira mientras le alcance la resistencia
+            shots = np.where(resistance >= 0, resistance // 5, 0)
+            maxShots = int(shots.max())
+            shotScores = self.getScores(self.random(shape + (maxShots,)), self.isWoman[..., None])
+            score = np.where(np.arange(maxShots) < shots[..., None], shotScores, 0).sum(axis=3)
+            scoreByGame += score
+            teamScoreByRound[:, r] += score.sum(axis=2)
+            loss = np.where(self.random(shape) < 0.5, 1, 2)
+            roundResistance -= np.where(remainingRoundsOfBonus > 0, 1, loss)
+            resistance = roundResistance.copy()
+
+            # Round.checkScores entre el mejor jugador de cada equipo
+            best = score.argmax(axis=2)
+            bestScore = score[games, teams, best]
+            tied = np.flatnonzero(bestScore[:, 0] == bestScore[:, 1])
+            while len(tied) > 0:
+                bonus = self.getScores(self.random((len(tied), nTeams)), self.isWoman[teams, best[tied]])
+                bestScore[tied] += bonus
+                scoreByGame[tied[:, None], teams, best[tied]] += bonus
+                tied = tied[bestScore[tied, 0] == bestScore[tied, 1]]
+            winnerTeam = (bestScore[:, 1] > bestScore[:, 0]).astype(np.int64)
+            winner = best[np.arange(nGames), winnerTeam]
+
+            # Player.increaseExperience del ganador de la ronda
+            winnerIndex = (np.arange(nGames), winnerTeam, winner)
+            wonRound[winnerIndex] += 1
+            experience[winnerIndex] += 3
+            bufferExperience[winnerIndex] += 3
+            bonusReached = bufferExperience[winnerIndex] == 9
+            remainingRoundsOfBonus[winnerIndex] = np.where(bonusReached, 3, remainingRoundsOfBonus[winnerIndex])
+            bufferExperience[winnerIndex] = np.where(bonusReached, 0, bufferExperience[winnerIndex])
+            womanWonRound[:, r] = self.isWoman[winnerTeam, winner]
+
+        return self.finishBatch(teamScoreByRound, womanWonRound, scoreByGame, wonRound, finalLuck, experience)
+
+    def finishBatch(self, teamScoreByRound, womanWonRound, scoreByGame, wonRound, finalLuck, experience):
+        """
+        Resuelve lo que depende del orden de los juegos (Round.setWinnerTeam y
+        Game.getWinnerTeam con el score acumulado de los equipos) y actualiza
+        los contadores acumulados de equipos y jugadores.
+        """
+        nGames, nTeams, nPlayers = scoreByGame.shape
+        rounds = teamScoreByRound.shape[1]
+        teamScore, winnerTeam = self.getWinnerTeams(self.teams, teamScoreByRound)
+
+        initialFinalScore = np.array([[player.finalScore for player in team.players] for team in self.teams])
+        finalScore = initialFinalScore + np.cumsum(scoreByGame, axis=0)
+        for t, team in enumerate(self.teams):
+            team.score = int(teamScore[t])
+            team.finalGameWon += int((winnerTeam == t).sum())
+            for p, player in enumerate(team.players):
+                player.finalScore = int(finalScore[-1, t, p])
+                player.finalWonRound += int(wonRound[:, t, p].sum())
+
+        # Game.getWinnerPlayer compara por score, que ya es 0 para todos al
+        # terminar el juego, así que gana el candidato del primer equipo
+        winnerPlayer = np.stack([np.zeros(nGames, dtype=np.int64), wonRound[:, 0].argmax(axis=1)], axis=1)
+        return {"winnerTeam": winnerTeam,
+                "roundsWonW": womanWonRound.sum(axis=1),
+                "roundsWonM": rounds - womanWonRound.sum(axis=1),
+                "winnerPlayer": winnerPlayer,
+                "luckiestPlayer": self.getBestPlayer(finalLuck),
+                "playerWithMostXP": self.getBestPlayer(experience),
+                "scoreByGame": scoreByGame,
+                "finalScore": finalScore,
+                "roundsWon": wonRound,
+                "luck": finalLuck,
+                "experience": experience}
+
+    @staticmethod
+    def getWinnerTeams(teams, teamScoreByRound):
+        """
+        Round.setWinnerTeam y Game.getWinnerTeam para juegos seguidos: cada
+        ronda la gana el equipo con más score acumulado, partiendo del score
+        actual de los equipos, y cada juego el que ganó más rondas.
+
+        Args:
+            teams (list): Equipos antes del primer juego.
+            teamScoreByRound (ndarray): Score de cada equipo en cada ronda,
+                de forma (juegos, rondas, equipos).
+
+        Returns:
+            tuple: Score acumulado de cada equipo al terminar el último juego
+            y el índice del equipo ganador de cada juego.
+        """
+        nGames, rounds, nTeams = teamScoreByRound.shape
+        initialTeamScore = np.array([team.score for team in teams], dtype=np.int64)
+        teamScore = initialTeamScore + np.cumsum(teamScoreByRound.reshape(nGames * rounds, nTeams), axis=0)
+        # max() se queda con el primer equipo en caso de empate
+        roundsWon = np.zeros((nGames, nTeams), dtype=np.int64)
+        roundWinners = teamScore.argmax(axis=1).reshape(nGames, rounds)
+        for t in range(0, nTeams):
+            roundsWon[:, t] = (roundWinners == t).sum(axis=1)
+        finalTeamScore = teamScore[-1] if len(teamScore) > 0 else initialTeamScore
+        return finalTeamScore, roundsWon.argmax(axis=1)
+
+    def getBestPlayer(self, values):
+        """
+        Índices (equipo, jugador) del primer jugador con el mayor valor, como
+        max() sobre el mejor de cada equipo en Game.
+
+        Args:
+            values (ndarray): Valores por juego, equipo y jugador.
+
+        Returns:
+            ndarray: Un par (equipo, jugador) por juego.
+        """
+        bestByTeam = values.argmax(axis=2)
+        bestValues = np.take_along_axis(values, bestByTeam[:, :, None], axis=2)[:, :, 0]
+        team = bestValues.argmax(axis=1)
+        return np.stack([team, bestByTeam[np.arange(len(team)), team]], axis=1)
@@ -0,0 +1,294 @@
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+
+import numpy as np
+
+import taller_sc as pse
+from Game import Game
+from Montecarlo import Montecarlo
+from Round import Round
+from Team import Team
+from VectorEngine import VectorEngine
+
+# Semilla de referencia de los benchmarks: la primera de pse.seedsMonteCarlo
+seed = pse.seedsMonteCarlo[0][0:6]
+
+# Directorios temporales de un benchmark; measure los borra al terminarlo
+temporaryDirectories = contextlib.ExitStack()
+
+# Cache del flujo de los benchmarks que simulan, en un directorio temporal
+# de la sesión que main borra al terminar
+streamCache = contextlib.ExitStack()
+streamCacheDir = None
+
+
+def getTestBlocks(nBlocks):
+    """
+    Bloques de 50 números como los que prueba generateBlocksTested, sin
+    repetidos y sin los que ese generador descarta antes de probar.
+
+    Args:
+        nBlocks (int): Número de bloques a generar.
+
+    Returns:
+        list: Bloques que se pueden pasar a testNumbers.
+    """
+    Ri, Xi, Ni = pse.generateBlocksArray(*seed, np.arange(nBlocks))
+    ri, lengths = pse.getRepetitionsArray(Ri)
+    testable = (lengths > 1) & ~((ri[:, 0] > 0.0) & (ri[:, 0] < 0.0001))
+    return [ri[block, :lengths[block]].tolist() for block in np.flatnonzero(testable)]
+
+
+def newStream():
+    """
+    Reemplaza el flujo global por uno nuevo, para que cada repetición
+    consuma los mismos números.
+
+    El flujo lee la cache de un directorio temporal de la sesión, que la
+    primera llamada llena en paralelo con todas las semillas; así los
+    tiempos no dependen de lo que ya haya en ~/.cache/montecarlo.
+    """
+    global streamCacheDir
+    if streamCacheDir is None:
+        streamCacheDir = streamCache.enter_context(tempfile.TemporaryDirectory(prefix="montecarlo-bench-stream-"))
+        pse.MonteCarloStream(pse.seedsMonteCarlo, useCache=True, cacheDir=streamCacheDir).prepare()
+    pse.numbersMonteCarlo = pse.MonteCarloStream(pse.seedsMonteCarlo, useCache=True, cacheDir=streamCacheDir)
+
+
+def benchmarkLinearCongruential(size):
+    return lambda: pse.generateNumbersByLinearCongruential(*seed, size)
+
+
+def benchmarkLinearCongruentialArray(size):
+    return lambda: pse.generateArrayByLinearCongruential(*seed, size)
+
+
+def benchmarkTestNumbers(size):
+    blocks = getTestBlocks(size)
+
+    def run():
+        for block in blocks:
+            pse.testNumbers(block, 10)
+    return run
+
+
+def benchmarkTestNumbersArray(size):
+    blocks = getTestBlocks(size)
+    lengths = [len(block) for block in blocks]
+
+    def run():
+        for length in set(lengths):
+            pse.testNumbersArray(np.array([block for block in blocks if len(block) == length]), 10)
+    return run
+
+
+def benchmarkGenerateNumbersTested(size):
+    return lambda: pse.generateNumbersTested(*seed, size, 10)
+
+
+def benchmarkStartup(size):
+    return lambda: pse.generateNumbersForMonteCarlo(useCache=False).get()
+
+
+def benchmarkFullStartup(size):
+    # Genera y prueba todos los números de las primeras size semillas, sin
+    # cache, como el arranque que llenaba la cola completa al importar
+    seeds = pse.seedsMonteCarlo[0:size]
+    quantity = sum(seed[6] for seed in seeds)
+    return lambda: pse.MonteCarloStream(seeds, useCache=False).skip(quantity)
+
+
+def benchmarkCachedStartup(size):
+    cacheDir = temporaryDirectories.enter_context(tempfile.TemporaryDirectory(prefix="montecarlo-bench-"))
+    pse.MonteCarloStream(pse.seedsMonteCarlo, useCache=True, cacheDir=cacheDir).get()
+    return lambda: pse.MonteCarloStream(pse.seedsMonteCarlo, useCache=True, cacheDir=cacheDir).get()
+
+
+def benchmarkSimulateRound(size):
+    newStream()
+    teams = [Team("A", 0), Team("B", 1)]
+
+    def run():
+        for i in range(0, size):
+            Round(teams).simulateRound()
+            for team in teams:
+                team.restartScoreByPlayer()
+            if i % 10 == 9:
+                for team in teams:
+                    team.restartRoundsWon()
+                    team.restartSkills()
+    return run
+
+
+def benchmarkSimulateGame(size):
+    newStream()
+    teams = [Team("A", 0), Team("B", 1)]
+
+    def run():
+        for i in range(0, size):
+            Game(teams, i + 1).simulateGame()
+    return run
+
+
+def benchmarkHeadlessRun(size):
+    newStream()
+    monteCarlo = Montecarlo()
+    return lambda: monteCarlo.startSimulation(size)
+
+
+def benchmarkVectorEngine(size):
+    newStream()
+    engine = VectorEngine([Team("A", 0), Team("B", 1)], seed=0)
+    return lambda: engine.simulateBatch(size)
+
+
+# Nombre -> (función que prepara el benchmark, tamaño, tamaño con --quick, unidad)
+benchmarks = {
+    "linearCongruential": (benchmarkLinearCongruential, 200000, 20000, "números"),
+    "linearCongruentialArray": (benchmarkLinearCongruentialArray, 2000000, 200000, "números"),
+    "testNumbers": (benchmarkTestNumbers, 1000, 100, "bloques"),
+    "testNumbersArray": (benchmarkTestNumbersArray, 20000, 2000, "bloques"),
+    "generateNumbersTested": (benchmarkGenerateNumbersTested, 100000, 10000, "números"),
+    "monteCarloStartup": (benchmarkStartup, 1, 1, "arranques"),
+    "monteCarloFullStartup": (benchmarkFullStartup, len(pse.seedsMonteCarlo), 3, "semillas"),
+    "monteCarloCachedStartup": (benchmarkCachedStartup, 1, 1, "arranques"),
+    "simulateRound": (benchmarkSimulateRound, 5000, 500, "rondas"),
+    "simulateGame": (benchmarkSimulateGame, 1000, 100, "juegos"),
+    "headlessRun": (benchmarkHeadlessRun, 2000, 200, "juegos"),
+    "vectorEngine": (benchmarkVectorEngine, 100000, 10000, "juegos"),
+}
+
+
+def measure(prepare, size, repeat):
+    """
+    Mide un benchmark: el mejor tiempo de repeat ejecuciones y, en una
+    ejecución aparte, la memoria máxima reservada con tracemalloc. La
+    preparación no se cuenta en ninguna de las dos. Al terminar se borran
+    los directorios temporales que hayan creado las preparaciones.
+
+    Args:
+        prepare (callable): Recibe size y devuelve la función a medir.
+        size (int): Operaciones que hace cada ejecución.
+        repeat (int): Número de ejecuciones cronometradas.
+
+    Returns:
+        dict: Operaciones, segundos, operaciones por segundo y memoria máxima
+        en bytes.
+    """
+    with temporaryDirectories:
+        times = []
+        for i in range(0, repeat):
+            run = prepare(size)
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        run = prepare(size)
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    seconds = min(times)
+    return {"operations": size,
+            "seconds": seconds,
+            "opsPerSecond": size / seconds,
+            "peakMemoryBytes": peak}
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara los resultados con una línea base guardada.
+
+    Args:
+        results (dict): Resultados por benchmark.
+        baseline (dict): Resultados de la línea base.
+        threshold (float): Fracción de empeoramiento tolerada, tanto en
+            operaciones por segundo como en memoria máxima.
+
+    Returns:
+        dict: Por benchmark, el cambio relativo en velocidad y memoria y si
+        se considera una regresión.
+    """
+    changes = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        speed = (result["opsPerSecond"] / baseline[name]["opsPerSecond"]) - 1
+        memory = (result["peakMemoryBytes"] / max(baseline[name]["peakMemoryBytes"], 1)) - 1
+        changes[name] = {"speed": speed,
+                         "memory": memory,
+                         "regression": speed < -threshold or memory > threshold}
+    return changes
+
+
+def report(results, changes):
+    """
+    Imprime una tabla con los resultados y, si los hay, los cambios.
+    """
+    print(f"{'benchmark':<26}{'ops/s':>14}{'segundos':>11}{'memoria MB':>12}{'velocidad':>11}{'memoria':>9}")
+    for name, result in results.items():
+        line = (f"{name:<26}{result['opsPerSecond']:>14.1f}{result['seconds']:>11.3f}"
+                f"{result['peakMemoryBytes'] / 2**20:>12.2f}")
+        if name in changes:
+            change = changes[name]
+            line += f"{change['speed']:>+11.1%}{change['memory']:>+9.1%}"
+            if change["regression"]:
+                line += "  REGRESIÓN"
+        print(line)
+
+
+def parseArguments(argv):
+    parser = argparse.ArgumentParser(description="Benchmarks del generador, las pruebas y el simulador.")
+    parser.add_argument("names", nargs="*", help="benchmarks a correr (por defecto todos): " + ", ".join(benchmarks))
+    parser.add_argument("--quick", action="store_true", help="usa tamaños pequeños")
+    parser.add_argument("--repeat", type=int, default=3, help="ejecuciones cronometradas por benchmark")
+    parser.add_argument("--save", help="guarda los resultados como línea base en este archivo JSON")
+    parser.add_argument("--baseline", help="archivo JSON de una línea base contra la cual comparar")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="empeoramiento tolerado antes de marcar una regresión (por defecto 0.1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Corre los benchmarks pedidos. Termina con código 1 si alguno empeoró
+    más que el umbral respecto a la línea base.
+
+    Args:
+        argv (list): Opcional, argumentos de la línea de comandos.
+    """
+    arguments = parseArguments(sys.argv[1:] if argv is None else argv)
+    for name in arguments.names:
+        if name not in benchmarks:
+            raise SystemExit(f"Benchmark desconocido: {name}")
+    global streamCacheDir
+    results = {}
+    with streamCache:
+        for name in arguments.names or benchmarks:
+            prepare, size, quickSize, unit = benchmarks[name]
+            results[name] = measure(prepare, quickSize if arguments.quick else size, arguments.repeat)
+            results[name]["unit"] = unit
+    streamCacheDir = None
+
+    changes = {}
+    if arguments.baseline:
+        with open(arguments.baseline) as baselineFile:
+            changes = compare(results, json.load(baselineFile)["results"], arguments.threshold)
+    report(results, changes)
+    if arguments.save:
+        with open(arguments.save, "w") as output:
+            json.dump({"python": platform.python_version(),
+                       "numpy": np.__version__,
+                       "machine": platform.machine(),
+                       "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                       "results": results}, output, indent=2)
+    if any(change["regression"] for change in changes.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,39 @@ import numpy as np
 from scipy.stats import norm
 from scipy.stats import chi2
 import queue
+import functools
+import hashlib
+import inspect
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from Profiler import Profiler
 
 #Util
 
 def truncate(number):
   return float(f'%.{5}f'%(number))
 
+def truncateArray(numbers):
+  #Same result as applying truncate to every element. Values whose scaled
+  #form is too close to a rounding boundary (or too large) go through
+  #truncate itself so the output is bit-identical.
+  numbers = np.asarray(numbers, dtype=np.float64)
+  scaled = numbers * 100000.0
+  rounded = np.rint(scaled)
+  with np.errstate(invalid='ignore'):
+    unsure = ~np.isfinite(scaled) | (np.abs(scaled) >= 2.0**52)
+    unsure |= np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+  result = np.copysign(rounded / 100000.0, numbers)
+  if(unsure.any()):
+    result[unsure] = [truncate(num) for num in numbers[unsure]]
+  return result
+
 #Pseudo-random number generation
 
 def generateNumbersByMeanSquares(seed, min, max, quantity):
@@ -80,6 +107,110 @@ def generateNumbersByMultiplicativeCongruential(Xo, t, g, min, max, quantity):
 
   return Ri, Xi, Ni
 
+#Jump-ahead: n steps of X -> (a * X + c) mod m compose into one affine map
+#X -> (A * X + C) mod m, obtained by repeated squaring in O(log n).
+
+def getLinearCongruentialJump(k, c, g, n):
+  m = 1 << g
+  a = 1 + 2 * k
+  A, C = 1, 0
+  baseA, baseC = a % m, c % m
+  while(n > 0):
+    if(n & 1):
+      A, C = (baseA * A) % m, ((baseA * C) + baseC) % m
+    baseA, baseC = (baseA * baseA) % m, ((baseA * baseC) + baseC) % m
+    n >>= 1
+  return A, C
+
+def skipLinearCongruential(Xo, k, c, g, n):
+  #State after n steps: generateNumbersByLinearCongruential(Xo, ...)[1][n - 1]
+  A, C = getLinearCongruentialJump(k, c, g, n)
+  return ((A * Xo) + C) % (1 << g)
+
+def splitLinearCongruential(Xo, k, c, g, nStreams, streamLength):
+  #Seeds of nStreams consecutive, disjoint substreams of streamLength numbers:
+  #generating streamLength numbers from each seed in order gives the same
+  #sequence as generating nStreams * streamLength numbers from Xo.
+  A, C = getLinearCongruentialJump(k, c, g, streamLength)
+  m = 1 << g
+  seeds = [Xo]
+  for i in range(1, nStreams):
+    seeds.append(((A * seeds[-1]) + C) % m)
+  return seeds
+
+@functools.lru_cache(maxsize=None)
+def getBlockJumps(k, c, length=50):
+  #Jumps of 1..length steps mod 2^64; reduced mod 2^g they are the jumps for
+  #any m = 2^g with g <= 64, since 2^g divides 2^64
+  jumps = [getLinearCongruentialJump(k, c, 64, n) for n in range(1, length + 1)]
+  A = np.array([A for A, C in jumps], dtype=np.uint64)
+  C = np.array([C for A, C in jumps], dtype=np.uint64)
+  A.setflags(write=False)
+  C.setflags(write=False)
+  return A, C
+
+#Array variants: same sequences as the list versions, built in bulk.
+#m = 2^g, so the recurrence can run on wrapping uint64 arithmetic and a mask.
+
+def generateCongruentialArray(Xo, a, c, g, quantity):
+  mask = (1 << g) - 1
+  Xi = np.empty(np.maximum(quantity, 0), dtype=np.uint64)
+  if(quantity <= 0):
+    return Xi
+  Xi[0] = ((a * Xo) + c) & mask
+  #(A, C) maps X_i to X_(i+length); it is squared each time the filled prefix doubles
+  A = a & mask
+  C = c & mask
+  length = 1
+  while(length < quantity):
+    step = min(length, quantity - length)
+    Xi[length:length + step] = (Xi[0:step] * np.uint64(A) + np.uint64(C)) & np.uint64(mask)
+    C = ((A * C) + C) & mask
+    A = (A * A) & mask
+    length += step
+  return Xi
+
+def generateArrayByLinearCongruential(Xo, k, c, g, min, max, quantity, offset=0):
+  #With offset, the numbers from position offset of the sequence on, reached
+  #with skipLinearCongruential instead of generating the ones before them
+  if(not isinstance(g, int) or not(g >= 0) or g > 62):
+    if(offset > 0):
+      Xo = skipLinearCongruential(Xo, k, c, g, offset)
+    data = generateNumbersByLinearCongruential(Xo, k, c, g, min, max, quantity)
+    if(isinstance(data, str)):
+      return data
+    return np.array(data[0]), np.array(data[1]), np.array(data[2])
+  m = 1 << g
+  a = 1 + 2 * k
+  if(not isinstance(k, int) or not(k >= 0 and k < m)):
+    return "Ingrese otro parametro para k"
+  if(not(a >= 0 and a < m)):
+    return "Ingrese otro parametro para k (a)"
+  if(not isinstance(Xo, int) or not(Xo >= 0 and Xo < m)):
+    return "Ingrese otro parametro para Xo"
+  if(not isinstance(c, int) or not(c >=0 and c < m)):
+    return "Ingrese otro parametro para c"
+
+  if(offset > 0):
+    Xo = skipLinearCongruential(Xo, k, c, g, offset)
+  Xi = generateCongruentialArray(Xo, a, c, g, quantity).astype(np.int64)
+  Ri = truncateArray(Xi / (m - 1))
+  Ni = min + (max - min) * Ri
+
+  return Ri, Xi, Ni
+
+def generateArrayByMultiplicativeCongruential(Xo, t, g, min, max, quantity):
+  if(g > 62):
+    Ri, Xi, Ni = generateNumbersByMultiplicativeCongruential(Xo, t, g, min, max, quantity)
+    return np.array(Ri), np.array(Xi), np.array(Ni)
+  a = (8 * t) + 3
+  m = 1 << g
+  Xi = generateCongruentialArray(Xo % m, a % m, 0, g, quantity).astype(np.int64)
+  Ri = truncateArray(Xi / (m - 1))
+  Ni = min + (max - min) * Ri
+
+  return Ri, Xi, Ni
+
 def generateNumbersByUniformDistribution(min, max, quantity):
   Ri, Xi, Ni = generateNumbersTested(1,3,6,7,min,max,quantity,10)
   return Ri, Xi, Ni
@@ -92,6 +223,8 @@ def generateNumbersByNormalDistribution(desv, mean, quantity):
   
 #Test pseudo-random numbers
 
+dicKS = {1:0.97500, 2:0.84189, 3:0.70760, 4:0.62394, 5:0.56328, 6:0.51926, 7:0.48342, 8:0.45427, 9:0.43001, 10:0.40925, 11:0.39122, 12:0.37543, 13:0.36143, 14:0.34890, 15:0.33750, 16:0.32733, 17:0.31796, 18:0.30936, 19:0.30143, 20:0.29408, 21:0.28724, 22:0.28087, 23:0.27491, 24:0.26931, 25:26404, 26:24908, 27:0.25438, 28:0.24993, 29:0.24571, 30:0.24170, 31:0.23788, 32:0.23424, 33:0.23076, 34:0.22743, 35:0.22425, 36:0.22119, 37:0.21826, 38:0.21544, 39:0.21273, 40:0.21012, 41:0.20760, 42:0.20517, 43:0.20283, 44:0.20056, 45:0.19837, 46:0.19625, 47:0.19420, 48:0.19221, 49:0.19028, 50:0.18841}
+
 def meanTest(Ri):
   size = len(Ri)
   alpha = 0.05
@@ -171,7 +304,6 @@ def testKS(Ri, nIntervals):
   percentageExpected = [i / len(Ri) for i in expectedFrequencies]
   difference = [truncate(np.abs(percentageExpected[i] - percentageObtained[i])) for i in range(0, len(percentageObtained))]
 
-  dicKS = {1:0.97500, 2:0.84189, 3:0.70760, 4:0.62394, 5:0.56328, 6:0.51926, 7:0.48342, 8:0.45427, 9:0.43001, 10:0.40925, 11:0.39122, 12:0.37543, 13:0.36143, 14:0.34890, 15:0.33750, 16:0.32733, 17:0.31796, 18:0.30936, 19:0.30143, 20:0.29408, 21:0.28724, 22:0.28087, 23:0.27491, 24:0.26931, 25:26404, 26:24908, 27:0.25438, 28:0.24993, 29:0.24571, 30:0.24170, 31:0.23788, 32:0.23424, 33:0.23076, 34:0.22743, 35:0.22425, 36:0.22119, 37:0.21826, 38:0.21544, 39:0.21273, 40:0.21012, 41:0.20760, 42:0.20517, 43:0.20283, 44:0.20056, 45:0.19837, 46:0.19625, 47:0.19420, 48:0.19221, 49:0.19028, 50:0.18841}
   maxDiff = max(difference)
 
   if(len(Ri) <= 50):
@@ -229,6 +361,107 @@ def testNumbers(Ri, nIntervals):
   
   return meanTest(Ri)[0] and varianceTest(Ri)[0] and testChi2Uniformity(Ri, nIntervals)[0] and testKS(Ri, nIntervals)[0] and testPoker(Ri)[0]
 
+#Array test battery: every row of blocks is one sample of the same size,
+#and the result matches testNumbers row by row.
+
+#Columns follow the categories of testPoker: D, O, T, K, F, P, Q
+pokerProbabilities = [0.3024, 0.5040, 0.1080, 0.0720, 0.0090, 0.0045, 0.0001]
+
+@functools.lru_cache(maxsize=None)
+def getCriticalValues(size, nIntervals):
+  alpha = 0.05
+  Z = truncate(norm.ppf(1 - (alpha / 2)))
+  Li = (1 / 2) - (Z * (1 / np.sqrt(12 * size)))
+  Ls = (1 / 2) + (Z * (1 / np.sqrt(12 * size)))
+  LIR = truncate(chi2.isf((alpha / 2), size -1)) / (12 * (size-1))
+  LSR = truncate(chi2.isf(1 - (alpha / 2), size -1)) / (12 * (size - 1))
+  chi2Critical = chi2.isf(0.05, nIntervals - 1)
+  expectedFrequencies = [truncate((size * (i+1)) / nIntervals) for i in range(0, nIntervals)]
+  percentageExpected = np.array([i / size for i in expectedFrequencies])
+  dMaxP = dicKS[size] if size <= 50 else 1.36/np.sqrt(size)
+  Ei = np.array([truncate(prob * size) for prob in pokerProbabilities])
+  pokerCritical = chi2.isf(0.05, 6)
+  return Li, Ls, LIR, LSR, chi2Critical, percentageExpected, dMaxP, Ei, pokerCritical
+
+def sumColumns(values):
+  #Left to right, like the built-in sum the scalar tests use
+  result = values[:, 0]
+  for j in range(1, values.shape[1]):
+    result = result + values[:, j]
+  return result
+
+def classifyNumbersArray(Ri, nIntervals):
+  rows = Ri.shape[0]
+  minRi = Ri.min(axis=1)
+  maxRi = Ri.max(axis=1)
+  sizeInterval = truncateArray((maxRi - minRi) / nIntervals)
+  bounds = np.empty((rows, nIntervals + 1))
+  bounds[:, 0] = minRi
+  for j in range(1, nIntervals + 1):
+    bounds[:, j] = bounds[:, j - 1] + sizeInterval
+  bounds = truncateArray(bounds)
+  #Repeated intervals collapse into one dict key in classifyNumbers
+  regular = (np.diff(bounds, axis=1) > 0).all(axis=1)
+
+  position = (Ri[:, :, None] > bounds[:, None, :]).sum(axis=2) - 1
+  valid = (position >= 0) & (position < nIntervals) & (Ri != minRi[:, None]) & (Ri != maxRi[:, None])
+  rowIndex = np.broadcast_to(np.arange(rows)[:, None], Ri.shape)
+  frequencies = np.bincount((rowIndex * nIntervals + position)[valid], minlength=rows * nIntervals).reshape(rows, nIntervals)
+  frequencies[:, 0] += 1
+  frequencies[:, nIntervals - 1] += 1
+  return frequencies, regular
+
+def classifyNumbersPokerArray(Ri):
+  number = np.rint(Ri * 100000.0).astype(np.int64)
+  #Only "0.ddddd" values have their digits read straight from the integer
+  regular = ((number / 100000.0 == Ri) & (number >= 10) & (number < 100000)).all(axis=1)
+  digits = (number[:, :, None] // np.array([10000, 1000, 100, 10, 1])) % 10
+  counts = (digits[:, :, :, None] == np.arange(10)).sum(axis=2)
+  distinct = (counts > 0).sum(axis=2)
+  maxCount = counts.max(axis=2)
+  pairs = (counts == 2).sum(axis=2)
+
+  classification = np.full(number.shape, 1)
+  classification[pairs == 2] = 2
+  classification[maxCount == 3] = 3
+  classification[(maxCount == 3) & (pairs == 1)] = 4
+  classification[maxCount == 4] = 5
+  classification[maxCount == 5] = 6
+  classification[distinct == 5] = 0
+
+  rows = Ri.shape[0]
+  rowIndex = np.arange(rows)[:, None]
+  classificationCount = np.bincount((rowIndex * 7 + classification).ravel(), minlength=rows * 7).reshape(rows, 7)
+  return classificationCount, regular
+
+def testNumbersArray(Ri, nIntervals):
+  Ri = np.asarray(Ri, dtype=np.float64)
+  rows, size = Ri.shape
+  if(rows == 0):
+    return np.zeros(0, dtype=bool)
+  Li, Ls, LIR, LSR, chi2Critical, percentageExpected, dMaxP, Ei, pokerCritical = getCriticalValues(size, nIntervals)
+
+  mean = np.mean(Ri, axis=1)
+  var = np.var(Ri, axis=1)
+  passed = (mean >= Li) & (mean <= Ls) & (var >= LSR) & (var <= LIR)
+
+  frequencies, regularIntervals = classifyNumbersArray(Ri, nIntervals)
+  expectedFrequency = frequencies.sum(axis=1) / nIntervals
+  chi2Values = np.square(frequencies - expectedFrequency[:, None]) / expectedFrequency[:, None]
+  passed &= chi2Critical > sumColumns(chi2Values)
+
+  percentageObtained = np.cumsum(frequencies, axis=1) / size
+  difference = truncateArray(np.abs(percentageExpected - percentageObtained))
+  passed &= difference.max(axis=1) < dMaxP
+
+  classificationCount, regularPoker = classifyNumbersPokerArray(Ri)
+  aux = truncateArray(np.square(Ei - classificationCount) / Ei)
+  passed &= sumColumns(aux) < pokerCritical
+
+  for i in np.flatnonzero(~(regularIntervals & regularPoker)):
+    passed[i] = testNumbers(Ri[i].tolist(), nIntervals)
+  return passed
+
 def getRepetitions(ri):
   first = ri[0]
   result = [first]
@@ -249,39 +482,253 @@ def sinRepetidos(ri):
         lista_sin_repetidos.append(elemento)
   return lista_sin_repetidos
 
+def getRepetitionsArray(ri):
+  #Row-wise getRepetitions: kept values are moved to the front of each row
+  first = ri[:, :1]
+  repeated = ri[:, 1:] == first
+  cutoff = np.where(repeated.any(axis=1), repeated.argmax(axis=1) + 1, ri.shape[1])
+  column = np.arange(ri.shape[1])
+  keep = (column < cutoff[:, None]) & ((column == 0) | ((ri != 0.0) & (ri != 1.0) & (ri >= 0.0001)))
+  order = np.argsort(~keep, axis=1, kind='stable')
+  return np.take_along_axis(ri, order, axis=1), keep.sum(axis=1)
+
+def generateBlocksArray(Xo, k, c, g, min, max, blocks):
+  #The given blocks of generateBlocksTested, before testing. Block b starts
+  #the generator at Xo + 50b with the smallest g that fits it, so any block
+  #can be built without the ones before it. Number i of a block is the jump
+  #of i + 1 steps from its start (getBlockJumps), so the 50 numbers of all
+  #the blocks are computed at once instead of stepping through each block.
+  A, C = getBlockJumps(k, c)
+  nBlocks = len(blocks)
+  XoBlocks = [Xo + 50 * int(block) for block in blocks]
+  gBlocks = np.maximum(g, [XoBlock.bit_length() for XoBlock in XoBlocks])
+  Xi = np.empty((nBlocks, 50), dtype=np.int64)
+  Ri = np.empty((nBlocks, 50))
+  for gBlock in np.unique(gBlocks):
+    rows = np.flatnonzero(gBlocks == gBlock)
+    m = 1 << int(gBlock)
+    mask = np.uint64(m - 1)
+    X = np.array([XoBlocks[row] for row in rows], dtype=np.uint64)
+    Xi[rows] = ((X[:, None] * A) + C) & mask
+    Ri[rows] = truncateArray(Xi[rows] / (m - 1))
+  Ni = min + (max - min) * Ri
+  return Ri, Xi, Ni
+
+def generateBlocksTested(Xo, k, c, g, min, max, nIntervals, blocksPerBatch=1024, substream=0, nSubstreams=1, stats=None, profile=True):
+  #Yields (ri, xi, ni) for every 50-number block that passes testNumbers,
+  #in the same order generateNumbersTested accumulates them. Substream i of n
+  #only visits blocks i, i + n, i + 2n, ..., so the n substreams are disjoint.
+  #With stats, blocksTried, blocksAccepted, blocksRejected and
+  #blocksUntestable count the blocks up to the last one yielded, and so do
+  #the block counts of the active Profiler unless profile is False.
+  data = generateNumbersByLinearCongruential(Xo, k, c, g, min, max, 0)
+  if(isinstance(data, str)):
+    raise ValueError(data)
+  profiler = Profiler.active if profile else None
+  firstBlock = 0
+  rejectedBefore = 0
+  untestableBefore = 0
+  while(True):
+    blocks = substream + nSubstreams * np.arange(firstBlock, firstBlock + blocksPerBatch)
+    Ri, Xi, Ni = generateBlocksArray(Xo, k, c, g, min, max, blocks)
+    ri, lengths = getRepetitionsArray(Ri)
+    #The list version retries a block with a single number forever, and
+    #testPoker raises on a value below 0.0001 (only possible as the first of a
+    #block). Neither happens within the seeds' quantities; here both blocks
+    #are rejected so substreams can pass over them.
+    testable = (lengths > 1) & ~((ri[:, 0] > 0.0) & (ri[:, 0] < 0.0001))
+    passed = np.zeros(blocksPerBatch, dtype=bool)
+    for length in np.unique(lengths[testable]):
+      rows = (lengths == length) & testable
+      passed[rows] = testNumbersArray(ri[rows, :length], nIntervals)
+    #Rejected and untestable blocks before each block, for the profiler
+    rejected = np.concatenate(([0], np.cumsum(testable & ~passed)))
+    untestable = np.concatenate(([0], np.cumsum(~testable)))
+    counted = 0
+
+    for block in np.flatnonzero(passed):
+      if(stats is not None):
+        stats["blocksTried"] = firstBlock + int(block) + 1
+        stats["blocksAccepted"] += 1
+        stats["blocksRejected"] = rejectedBefore + int(rejected[block + 1])
+        stats["blocksUntestable"] = untestableBefore + int(untestable[block + 1])
+      if(profiler is not None):
+        profiler.count("blocksAccepted")
+        profiler.count("blocksRejected", int(rejected[block + 1] - rejected[counted]))
+        profiler.count("blocksUntestable", int(untestable[block + 1] - untestable[counted]))
+      counted = block + 1
+      yield ri[block, :lengths[block]].tolist(), Xi[block], Ni[block]
+    #Only reached when more blocks are asked for, so the rest were tried
+    if(profiler is not None):
+      profiler.count("blocksRejected", int(rejected[-1] - rejected[counted]))
+      profiler.count("blocksUntestable", int(untestable[-1] - untestable[counted]))
+    firstBlock += blocksPerBatch
+    rejectedBefore += int(rejected[-1])
+    untestableBefore += int(untestable[-1])
+
 def generateNumbersTested(Xo, k, c, g, min, max, quantity, nIntervals):
   
   ri_result = []
   xi_result = []
   ni_result = []
-  while(len(ri_result) < quantity):
-    
-    data = generateNumbersByLinearCongruential(Xo, k, c, g, min, max, 50)
-    ri = data[0]
-    xi = data[1]
-    ni = data[2]
-    ri = getRepetitions(ri)
-
-    if(len(ri) == 1):
-      continue
-    if testNumbers(ri, nIntervals):
-      for num in ri:
-        ri_result.append(num)
-      for num in xi:
-        xi_result.append(num)
-      for num in ni:
-        ni_result.append(num)
-    
-    m = np.power(2, g)
-    Xo = Xo + 50
-    if m <= Xo:
-      while( m <= Xo):
-        g = g + 1
-        m = np.power(2, g)
+  if(quantity <= 0):
+    return ri_result, xi_result, ni_result
+  for ri, xi, ni in generateBlocksTested(Xo, k, c, g, min, max, nIntervals):
+    ri_result.extend(ri)
+    xi_result.extend(xi.tolist())
+    ni_result.extend(ni.tolist())
+    if(len(ri_result) >= quantity):
+      break
   
   return ri_result[0:quantity], xi_result, ni_result
 
 
+#Cache of validated streams: one .npy file per seed, opened memory-mapped.
+#The key includes the source of the functions that generate and test the
+#numbers (and the tables they read), so a change to any of them starts a new
+#set of files; edits elsewhere in this module keep the cache. The directory
+#may be shared by several checkouts with different sources, so the files of
+#other sources are only removed on request, with --prune. Next to each .npy
+#a .json file keeps the block counts of its seed (streamCountNames), which the
+#stream reports to the active Profiler when it reads the seed from the cache.
+
+streamCacheVersion = 3
+streamCountNames = ("blocksTried", "blocksAccepted", "blocksRejected", "blocksUntestable")
+streamCacheDir = os.environ.get("MONTECARLO_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "montecarlo"))
+
+@functools.lru_cache(maxsize=None)
+def getSourceHash():
+  digest = hashlib.sha256(str(streamCacheVersion).encode())
+  for function in streamSourceFunctions:
+    digest.update(inspect.getsource(function).encode())
+  digest.update(repr((dicKS, pokerProbabilities)).encode())
+  return digest.hexdigest()
+
+def getStreamCachePath(Xo, k, c, g, min, max, quantity, nIntervals, cacheDir=None, substream=0, nSubstreams=1):
+  key = repr(((Xo, k, c, g, min, max, quantity, nIntervals), (substream, nSubstreams)))
+  name = "ri_" + getSourceHash()[0:16] + "_" + hashlib.sha256(key.encode()).hexdigest()[0:32] + ".npy"
+  return os.path.join(cacheDir or streamCacheDir, name)
+
+def getStreamCountsPath(path):
+  return path[0:-len(".npy")] + ".json"
+
+def pruneStreamCache(cacheDir=None):
+  #Removes the cache files written by other versions of the generator,
+  #including those of other checkouts that share the directory
+  cacheDir = cacheDir or streamCacheDir
+  current = "ri_" + getSourceHash()[0:16] + "_"
+  removed = 0
+  if(not os.path.isdir(cacheDir)):
+    return removed
+  for name in os.listdir(cacheDir):
+    if(name.startswith("ri_") and name.endswith((".npy", ".json")) and not name.startswith(current)):
+      try:
+        os.remove(os.path.join(cacheDir, name))
+        removed += 1
+      except OSError:
+        pass
+  return removed
+
+def generateArrayTested(Xo, k, c, g, min, max, quantity, nIntervals, substream=0, nSubstreams=1, stats=None):
+  #Ri of generateNumbersTested written straight into a float64 array
+  Ri = np.empty(np.maximum(quantity, 0))
+  position = 0
+  if(quantity <= 0):
+    return Ri
+  #Only used to build cache files, which may hold more numbers than a run
+  #reads, so the Profiler counts come from the stream instead (see stats)
+  for ri, xi, ni in generateBlocksTested(Xo, k, c, g, min, max, nIntervals, substream=substream, nSubstreams=nSubstreams, stats=stats, profile=False):
+    size = len(ri[0:quantity - position])
+    Ri[position:position + size] = ri[0:size]
+    position += size
+    if(position >= quantity):
+      break
+  return Ri
+
+def loadNumbersTested(Xo, k, c, g, min, max, quantity, nIntervals, cacheDir=None, substream=0, nSubstreams=1):
+  #Returns the numbers of the seed and its block counts (None if they could
+  #not be read)
+  path = getStreamCachePath(Xo, k, c, g, min, max, quantity, nIntervals, cacheDir, substream, nSubstreams)
+  if(os.path.exists(path)):
+    return np.load(path, mmap_mode='r'), loadStreamCounts(path)
+  counts = dict.fromkeys(streamCountNames, 0)
+  Ri = generateArrayTested(Xo, k, c, g, min, max, quantity, nIntervals, substream, nSubstreams, counts)
+  if(not saveNumbersTested(path, Ri, counts)):
+    return Ri, counts
+  return np.load(path, mmap_mode='r'), counts
+
+def loadStreamCounts(path):
+  try:
+    with open(getStreamCountsPath(path)) as countsFile:
+      counts = json.load(countsFile)
+  except (OSError, ValueError):
+    return None
+  return {name: int(counts[name]) for name in streamCountNames if name in counts}
+
+def saveNumbersTested(path, Ri, counts=None):
+  try:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    #Written under a temporary name first so other processes never see half
+    #a file; the counts go first, so they exist whenever the numbers do
+    if(counts is not None):
+      descriptor, temporaryPath = tempfile.mkstemp(suffix=".json", dir=os.path.dirname(path))
+      with os.fdopen(descriptor, "w") as temporary:
+        json.dump({name: counts[name] for name in streamCountNames}, temporary)
+      os.replace(temporaryPath, getStreamCountsPath(path))
+    descriptor, temporaryPath = tempfile.mkstemp(suffix=".npy", dir=os.path.dirname(path))
+    with os.fdopen(descriptor, "wb") as temporary:
+      np.save(temporary, Ri)
+    os.replace(temporaryPath, path)
+  except OSError:
+    return False
+  return True
+
+def getSubstreamQuantity(seed, substream=0, nSubstreams=1):
+  #Share of the seed's quantity that goes to the given substream
+  quantity = seed[6] // nSubstreams
+  if(substream < seed[6] % nSubstreams):
+    quantity += 1
+  return quantity
+
+def buildSeedStream(seed, nIntervals, cacheDir=None, substream=0, nSubstreams=1):
+  #Writes the cache file of one seed, unless it already exists, and returns
+  #what it cost: blocks tried and accepted, acceptance rate and seconds.
+  quantity = getSubstreamQuantity(seed, substream, nSubstreams)
+  path = getStreamCachePath(seed[0], seed[1], seed[2], seed[3], seed[4], seed[5], quantity, nIntervals, cacheDir, substream, nSubstreams)
+  stats = {"seed": list(seed), "substream": substream, "nSubstreams": nSubstreams, "quantity": quantity,
+           "cached": os.path.exists(path), "blocksTried": 0, "blocksAccepted": 0, "blocksRejected": 0, "blocksUntestable": 0,
+           "acceptanceRate": None, "seconds": 0.0}
+  if(stats["cached"] or quantity <= 0):
+    return stats
+  start = time.perf_counter()
+  Ri = generateArrayTested(seed[0], seed[1], seed[2], seed[3], seed[4], seed[5], quantity, nIntervals, substream, nSubstreams, stats)
+  if(not saveNumbersTested(path, Ri, stats)):
+    raise OSError("No se pudo escribir la cache de la semilla " + str(seed) + " en " + path)
+  stats["seconds"] = time.perf_counter() - start
+  stats["acceptanceRate"] = stats["blocksAccepted"] / stats["blocksTried"]
+  return stats
+
+def buildStreamCache(seeds, nIntervals=10, workers=None, cacheDir=None, substreams=(0,), nSubstreams=1):
+  #Builds the cache files of the seeds concurrently, one seed of one of the
+  #given substreams of n per task. The stream still reads the files in seed
+  #order, so its numbers are the same as building them one after another.
+  #Returns the stats of each seed, substream by substream and in seed order
+  #(see buildSeedStream).
+  jobs = [(seed, substream) for substream in substreams for seed in seeds]
+  if(workers == 1):
+    return [buildSeedStream(seed, nIntervals, cacheDir, substream, nSubstreams) for seed, substream in jobs]
+  with ProcessPoolExecutor(max_workers=workers) as executor:
+    futures = [executor.submit(buildSeedStream, seed, nIntervals, cacheDir, substream, nSubstreams) for seed, substream in jobs]
+    return [future.result() for future in futures]
+
+#Functions whose source is part of the stream cache key
+streamSourceFunctions = [truncate, truncateArray, generateNumbersByLinearCongruential, getLinearCongruentialJump,
+                         getBlockJumps, meanTest, varianceTest,
+                         testChi2Uniformity, createIntervals, classifyNumbers, testKS, classifyNumberPoker, testPoker,
+                         testNumbers, getCriticalValues, sumColumns, classifyNumbersArray, classifyNumbersPokerArray,
+                         testNumbersArray, getRepetitionsArray, generateBlocksArray, generateBlocksTested,
+                         generateArrayTested]
+
 #Frog Problem
 
 def simulateJumps1D(nJumps):
@@ -294,50 +741,200 @@ def simulateJumps1D(nJumps):
     result.append(sum)
   return result
 
-def generateNumbersForMonteCarlo():
-  seeds = seeds = [
-    [1,3,7,8,3,5, 517224], 
-   [1,3,6,7,3,5, 1742404], 
-   [1,2,3,4,3,5, 489860], 
-   [1,4,6,7,3,5, 582806], 
-   [1,3,8,9,3,5, 1982079], 
-   [1,3,7,9,3,5, 517374], 
-   [1,6,7,8,3,5,341131], 
-   [1,3,3,8,3,5, 1158110], 
-   [1,5,5,8,3,5,158679], 
-   [1,6,6,8,3,5,341913],
-   [1,2,5,9,3,5,491312],
-   [1,4,5,9,3,5,487932],
-   [1,3,5,9,3,5,1731755],
-   [1,3,3,9,3,5,1158261],
-   [1,3,3,5,3,5,1158150],
-   [1,2,3,5,3,5,489890],
-   [1,5,7,7,3,5,315028],
-   [1,7,7,7,3,5,529386],
-   [1,1,7,7,3,5,510442],
-   [1,4,7,7,3,5,487770],
-   [1,2,3,7,3,5,490009],
-   [3,5,3,7,3,5,314675],
-   [1,5,3,7,3,5,312823],
-   [1,3,3,7,3,5,1158205],
-   [1,2,2,7,3,5,286548],
-   [1,3,9,9,3,5,517469],
-   [1,3,10,9,3,5,2319500],
-   [1,2,10,9,3,5,486456],
-   [1,3,11,9,3,5,1987738],
-   [1,3,12,9,3,5,1976114],
-   [1,3,12,10,3,5,1976166],
-   [1,3,10,10,3,5,2319656],
-   [1,3,11,10,3,5,1987638],
-   [1,3,10,11,3,5,2319703],
-   [1,3,11,11,3,5,1987690]
-   ]
-  ri_result = queue.Queue()
-  for seed in seeds:
-    ri, xi, ni = generateNumbersTested(seed[0], seed[1],seed[2],seed[3],seed[4],seed[5],seed[6], 10)
-    for num in ri:
-      ri_result.put(num)
-    print(ri_result._qsize())
-  return ri_result
+#Monte Carlo stream
+
+#Xo, k, c, g, min, max, quantity
+seedsMonteCarlo = [
+  [1,3,7,8,3,5, 517224],
+  [1,3,6,7,3,5, 1742404],
+  [1,2,3,4,3,5, 489860],
+  [1,4,6,7,3,5, 582806],
+  [1,3,8,9,3,5, 1982079],
+  [1,3,7,9,3,5, 517374],
+  [1,6,7,8,3,5,341131],
+  [1,3,3,8,3,5, 1158110],
+  [1,5,5,8,3,5,158679],
+  [1,6,6,8,3,5,341913],
+  [1,2,5,9,3,5,491312],
+  [1,4,5,9,3,5,487932],
+  [1,3,5,9,3,5,1731755],
+  [1,3,3,9,3,5,1158261],
+  [1,3,3,5,3,5,1158150],
+  [1,2,3,5,3,5,489890],
+  [1,5,7,7,3,5,315028],
+  [1,7,7,7,3,5,529386],
+  [1,1,7,7,3,5,510442],
+  [1,4,7,7,3,5,487770],
+  [1,2,3,7,3,5,490009],
+  [3,5,3,7,3,5,314675],
+  [1,5,3,7,3,5,312823],
+  [1,3,3,7,3,5,1158205],
+  [1,2,2,7,3,5,286548],
+  [1,3,9,9,3,5,517469],
+  [1,3,10,9,3,5,2319500],
+  [1,2,10,9,3,5,486456],
+  [1,3,11,9,3,5,1987738],
+  [1,3,12,9,3,5,1976114],
+  [1,3,12,10,3,5,1976166],
+  [1,3,10,10,3,5,2319656],
+  [1,3,11,10,3,5,1987638],
+  [1,3,10,11,3,5,2319703],
+  [1,3,11,11,3,5,1987690]
+  ]
+
+class MonteCarloStream:
+  #Lazy replacement for the queue that used to be filled at import time.
+  #Validated numbers are produced from the seed list in the same order as
+  #before, but only chunkSize of them are held in memory at once. With
+  #useCache each seed is read from its memory-mapped cache file instead, and
+  #prepare builds the missing files in parallel beforehand. Without the
+  #cache the active Profiler counts the blocks up to the last one read; with
+  #it, all the blocks of each seed read (the counts saved with its file), and
+  #cachedSeeds counts those seeds.
+  #Substream i of n takes every n-th block of each seed and its share of the
+  #seed's quantity; the n substreams never repeat a block.
+
+  def __init__(self, seeds, nIntervals=10, chunkSize=65536, useCache=False, cacheDir=None, substream=0, nSubstreams=1):
+    self.seeds = seeds
+    self.nIntervals = nIntervals
+    self.chunkSize = chunkSize
+    self.useCache = useCache
+    self.cacheDir = cacheDir
+    self.substream = substream
+    self.nSubstreams = nSubstreams
+    self.consumed = 0
+    self.seedStats = None
+    self._blocks = self._iterateBlocks()
+    self._chunk = []
+    self._leftover = []
+    self._position = 0
+
+  def _iterateBlocks(self):
+    for seed in self.seeds:
+      quantity = getSubstreamQuantity(seed, self.substream, self.nSubstreams)
+      if(quantity <= 0):
+        continue
+      if(self.useCache):
+        Ri, counts = loadNumbersTested(seed[0], seed[1], seed[2], seed[3], seed[4], seed[5], quantity, self.nIntervals, self.cacheDir, self.substream, self.nSubstreams)
+        if(Profiler.active is not None):
+          Profiler.active.count("cachedSeeds")
+          for name in ("blocksAccepted", "blocksRejected", "blocksUntestable"):
+            if(counts is not None and name in counts):
+              Profiler.active.count(name, counts[name])
+        for start in range(0, quantity, self.chunkSize):
+          yield Ri[start:start + self.chunkSize].tolist()
+        continue
+      for ri, xi, ni in generateBlocksTested(seed[0], seed[1], seed[2], seed[3], seed[4], seed[5], self.nIntervals, substream=self.substream, nSubstreams=self.nSubstreams):
+        yield ri[0:quantity]
+        quantity -= len(ri)
+        if(quantity <= 0):
+          break
+
+  def prepare(self, workers=None, nSubstreams=None):
+    #Builds the cache files of all the seeds in a process pool and keeps
+    #their stats in seedStats. With nSubstreams it builds instead the files
+    #of every stream of split(nSubstreams), the ones a parallel run reads.
+    if(not self.useCache):
+      raise ValueError("Solo se pueden preparar en paralelo los flujos con cache")
+    substreams = [self.substream]
+    if(nSubstreams is None):
+      nSubstreams = self.nSubstreams
+    else:
+      substreams = range(0, nSubstreams)
+    self.seedStats = buildStreamCache(self.seeds, self.nIntervals, workers, self.cacheDir, substreams, nSubstreams)
+    return self.seedStats
+
+  def split(self, nSubstreams):
+    #Fresh streams over the same seeds for parallel workers
+    return [MonteCarloStream(self.seeds, self.nIntervals, self.chunkSize, self.useCache, self.cacheDir, i, nSubstreams) for i in range(0, nSubstreams)]
+
+  def _fill(self):
+    chunk = self._leftover
+    for block in self._blocks:
+      chunk.extend(block)
+      if(len(chunk) >= self.chunkSize):
+        break
+    self._chunk = chunk[0:self.chunkSize]
+    self._leftover = chunk[self.chunkSize:]
+    self._position = 0
+    if(len(self._chunk) == 0):
+      raise queue.Empty("Se agotaron los numeros pseudoaleatorios de las semillas")
+
+  def get(self):
+    if(self._position >= len(self._chunk)):
+      self._fill()
+    number = self._chunk[self._position]
+    self._position += 1
+    self.consumed += 1
+    return number
+
+  def skip(self, quantity):
+    #Advances the stream quantity numbers without returning them
+    while(quantity > 0):
+      if(self._position >= len(self._chunk)):
+        self._fill()
+      take = min(quantity, len(self._chunk) - self._position)
+      self._position += take
+      self.consumed += take
+      quantity -= take
+
+  def random(self, size):
+    #Next numbers of the stream as an array of the given shape
+    quantity = int(np.prod(size))
+    numbers = []
+    while(len(numbers) < quantity):
+      if(self._position >= len(self._chunk)):
+        self._fill()
+      take = min(quantity - len(numbers), len(self._chunk) - self._position)
+      numbers.extend(self._chunk[self._position:self._position + take])
+      self._position += take
+    self.consumed += quantity
+    return np.array(numbers, dtype=float).reshape(size)
+
+def generateNumbersForMonteCarlo(chunkSize=65536, useCache=True, substream=0, nSubstreams=1, seeds=None, workers=None):
+  #With workers, the cache files of the seeds are built up front in that many
+  #processes (None for one per CPU) instead of lazily while the stream is read
+  stream = MonteCarloStream(seeds or seedsMonteCarlo, 10, chunkSize, useCache, None, substream, nSubstreams)
+  if(workers is not None):
+    stream.prepare(workers)
+  return stream
 
 numbersMonteCarlo = generateNumbersForMonteCarlo()
+
+def printSeedStats(seedStats):
+  print(f"{'semilla':<34}{'bloques':>10}{'aceptación':>12}{'segundos':>10}")
+  for stats in seedStats:
+    if(stats["cached"]):
+      rate = "cache"
+    elif(stats["acceptanceRate"] is None):
+      #Nothing to generate, e.g. a seed with quantity 0
+      rate = "-"
+    else:
+      rate = f"{stats['acceptanceRate']:.1%}"
+    seed = str(stats["seed"][0:6])
+    if(stats["nSubstreams"] > 1):
+      seed += f" {stats['substream']}/{stats['nSubstreams']}"
+    print(f"{seed:<34}{stats['blocksTried']:>10}{rate:>12}{stats['seconds']:>10.2f}")
+  print(f"Total: {sum(stats['seconds'] for stats in seedStats):.1f} s de generación")
+
+if __name__ == "__main__":
+  #Builds the stream cache of the Monte Carlo seeds and reports the cost of each seed
+  parser = argparse.ArgumentParser(description="Construye en paralelo la cache de numeros validados de las semillas.")
+  parser.add_argument("--workers", type=int, help="numero de procesos (por defecto uno por CPU)")
+  parser.add_argument("--seeds", help="archivo JSON con una lista de semillas [Xo, k, c, g, min, max, cantidad]")
+  parser.add_argument("--output", help="archivo JSON donde se escriben las estadisticas por semilla")
+  parser.add_argument("--prune", action="store_true",
+                      help="borra antes los archivos de la cache escritos por otras versiones del generador, "
+                           "tambien los de otras copias del proyecto que usen el mismo directorio")
+  arguments = parser.parse_args(sys.argv[1:])
+  if(arguments.prune):
+    print(f"Archivos de otras versiones borrados: {pruneStreamCache()}")
+  seeds = seedsMonteCarlo
+  if(arguments.seeds):
+    with open(arguments.seeds) as seedsFile:
+      seeds = json.load(seedsFile)
+  seedStats = buildStreamCache(seeds, 10, arguments.workers)
+  printSeedStats(seedStats)
+  if(arguments.output):
+    with open(arguments.output, "w") as output:
+      json.dump(seedStats, output, indent=2)